@@ -0,0 +1,36 @@
+"""add jobs user active partial index
+
+Revision ID: a1f3c9d27b41
+Revises:
+Create Date: 2026-08-26 10:12:03.481927
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a1f3c9d27b41"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Partial index covering exactly the active statuses so the per-user
+    # concurrency-limit COUNT is an index-only scan over active jobs.
+    op.create_index(
+        "ix_jobs_user_active",
+        "jobs",
+        ["user_identifier"],
+        postgresql_where=sa.text(
+            "status IN ('QUEUED', 'PROCESSING', 'SEPARATING_DRUMS', "
+            "'PREDICTING', 'TRANSCRIBING')"
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_user_active", table_name="jobs")
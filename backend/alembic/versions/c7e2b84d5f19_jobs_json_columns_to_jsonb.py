@@ -0,0 +1,52 @@
+"""jobs json columns to jsonb
+
+Revision ID: c7e2b84d5f19
+Revises: a1f3c9d27b41
+Create Date: 2026-08-26 15:42:11.207364
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c7e2b84d5f19"
+down_revision: Union[str, None] = "a1f3c9d27b41"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # JSONB stores the parsed binary representation, so every read of
+    # hit_summary/warnings (status and result endpoints, webhook payload)
+    # skips the json re-parse the plain JSON type pays.
+    op.alter_column(
+        "jobs",
+        "hit_summary",
+        type_=postgresql.JSONB(),
+        postgresql_using="hit_summary::jsonb",
+    )
+    op.alter_column(
+        "jobs",
+        "warnings",
+        type_=postgresql.JSONB(),
+        postgresql_using="warnings::jsonb",
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        "jobs",
+        "hit_summary",
+        type_=postgresql.JSON(),
+        postgresql_using="hit_summary::json",
+    )
+    op.alter_column(
+        "jobs",
+        "warnings",
+        type_=postgresql.JSON(),
+        postgresql_using="warnings::json",
+    )
@@ -3,6 +3,7 @@ from typing import AsyncGenerator
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import async_session_factory
+from app.storage.backend import StorageBackend, get_storage
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
@@ -16,3 +17,12 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             raise
         finally:
             await session.close()
+
+
+def get_storage_backend() -> StorageBackend:
+    """Dependency that returns the process-lifetime storage backend.
+
+    The instance is built once at startup (lifespan), so requests never
+    pay backend construction cost (boto3 client setup for S3).
+    """
+    return get_storage()
@@ -1,4 +1,7 @@
-from fastapi import APIRouter, Depends
+import asyncio
+
+import orjson
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -9,37 +12,69 @@ from app.utils.logging import get_logger
 router = APIRouter()
 logger = get_logger(__name__)
 
+# Serialized once at import — load-balancer probes overwhelmingly hit the
+# all-healthy path, so skip the per-probe JSON encode
+_HEALTHY_BODY = orjson.dumps(
+    {
+        "status": "healthy",
+        "version": settings.APP_VERSION,
+        "checks": {
+            "database": {"status": "up"},
+            "redis": {"status": "up"},
+            "model": {
+                "status": "configured",
+                "version": settings.MODEL_VERSION,
+                "uri": settings.MODEL_URI,
+            },
+        },
+    }
+)
+
+
+async def _redis_ping(request: Request):
+    """Ping the shared Redis client, treating a missing client as down.
+
+    app.state.redis only exists once the lifespan has run; a health
+    endpoint should report that as degraded, not raise."""
+    client = getattr(request.app.state, "redis", None)
+    if client is None:
+        raise RuntimeError("redis client not initialized")
+    return await client.ping()
+
 
 @router.get("/health")
-async def health_check(db: AsyncSession = Depends(get_db)):
+async def health_check(request: Request, db: AsyncSession = Depends(get_db)):
     """Health check endpoint — verifies DB, Redis, and model availability."""
+    # DB and Redis checks run concurrently with per-check timeouts so a
+    # slow component bounds tail latency at max(checks), not their sum
+    db_result, redis_result = await asyncio.gather(
+        asyncio.wait_for(db.execute(text("SELECT 1")), timeout=1.0),
+        asyncio.wait_for(_redis_ping(request), timeout=1.0),
+        return_exceptions=True,
+    )
+
+    if not isinstance(db_result, BaseException) and not isinstance(
+        redis_result, BaseException
+    ):
+        return Response(content=_HEALTHY_BODY, media_type="application/json")
+
     health = {
-        "status": "healthy",
+        "status": "degraded",
         "version": settings.APP_VERSION,
         "checks": {},
     }
 
-    # Database check
-    try:
-        await db.execute(text("SELECT 1"))
+    if isinstance(db_result, BaseException):
+        health["checks"]["database"] = {"status": "down", "error": str(db_result)}
+        logger.error("health_check_db_failed", error=str(db_result))
+    else:
         health["checks"]["database"] = {"status": "up"}
-    except Exception as e:
-        health["status"] = "degraded"
-        health["checks"]["database"] = {"status": "down", "error": str(e)}
-        logger.error("health_check_db_failed", error=str(e))
-
-    # Redis check
-    try:
-        import redis.asyncio as aioredis
-
-        r = aioredis.from_url(settings.REDIS_URL)
-        await r.ping()
-        await r.aclose()
+
+    if isinstance(redis_result, BaseException):
+        health["checks"]["redis"] = {"status": "down", "error": str(redis_result)}
+        logger.error("health_check_redis_failed", error=str(redis_result))
+    else:
         health["checks"]["redis"] = {"status": "up"}
-    except Exception as e:
-        health["status"] = "degraded"
-        health["checks"]["redis"] = {"status": "down", "error": str(e)}
-        logger.error("health_check_redis_failed", error=str(e))
 
     # Model availability check (just checks if path/URI is configured)
     health["checks"]["model"] = {
@@ -48,7 +83,6 @@ async def health_check(db: AsyncSession = Depends(get_db)):
         "uri": settings.MODEL_URI,
     }
 
-    status_code = 200 if health["status"] == "healthy" else 503
     from fastapi.responses import JSONResponse
 
-    return JSONResponse(content=health, status_code=status_code)
+    return JSONResponse(content=health, status_code=503)
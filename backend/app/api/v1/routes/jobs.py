@@ -2,12 +2,25 @@ import uuid
 from pathlib import Path
 from typing import Optional
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, UploadFile
-from fastapi.responses import FileResponse
-from sqlalchemy import select
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    File,
+    Form,
+    HTTPException,
+    Request,
+    UploadFile,
+    WebSocket,
+    WebSocketDisconnect,
+)
+from fastapi.responses import FileResponse, StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.v1.deps import get_db
+from app.api.v1.deps import get_db, get_storage_backend
+from app.core.database import async_session_factory
 from app.core.config import settings
 from app.models.job import InputType, Job, JobStatus
 from app.schemas.job import (
@@ -18,20 +31,64 @@ from app.schemas.job import (
     JobStatusResponse,
     HitData,
 )
-from app.core.security import check_concurrency_limit
-from app.storage.backend import get_storage
+from app.core.security import check_concurrency_limit, release_concurrency_slot_async
+from app.storage.backend import StorageBackend
 from app.utils.logging import get_logger
-from app.worker import celery_app, dispatch_pipeline
+from app.worker import celery_app, cleanup_job_artifacts, dispatch_pipeline
 
 router = APIRouter(prefix="/jobs", tags=["jobs"])
 logger = get_logger(__name__)
 
+# Column projections for the hot read paths — avoids hydrating full ORM
+# instances (and large JSON blobs) when only a few fields are returned.
+STATUS_COLS = (
+    Job.id,
+    Job.status,
+    Job.progress,
+    Job.created_at,
+    Job.updated_at,
+    Job.title,
+    Job.error_message,
+    Job.compute_time_ms,
+    Job.model_version,
+    Job.warnings,
+)
+
+RESULT_COLS = (
+    Job.id,
+    Job.status,
+    Job.detected_bpm,
+    Job.bpm_unreliable,
+    Job.duration_seconds,
+    Job.confidence_score,
+    Job.warnings,
+    Job.compute_time_ms,
+    Job.model_version,
+    Job.hit_summary,
+    Job.result_musicxml_path,
+    Job.result_pdf_path,
+)
+
+DOWNLOAD_COLS = (
+    Job.status,
+    Job.result_musicxml_path,
+    Job.result_pdf_path,
+    Job.title,
+)
+
+# format → (row attribute, media type); adding a format is one entry here
+DOWNLOAD_FORMATS = {
+    "musicxml": ("result_musicxml_path", "application/vnd.recordare.musicxml+xml"),
+    "pdf": ("result_pdf_path", "application/pdf"),
+}
+
 
 def _get_user_identifier(request: Request) -> str:
     """Extract user identifier from request (IP-based for now)."""
-    forwarded = request.headers.get("X-Forwarded-For")
+    forwarded = request.headers.get("x-forwarded-for")
     if forwarded:
-        return forwarded.split(",")[0].strip()
+        # partition avoids the list allocation of split() on multi-hop XFF
+        return forwarded.partition(",")[0].strip()
     return request.client.host if request.client else "unknown"
 
 
@@ -39,47 +96,65 @@ def _validate_file(file: UploadFile) -> None:
     """Validate uploaded file type and size."""
     if file.filename:
         ext = file.filename.rsplit(".", 1)[-1].lower() if "." in file.filename else ""
-        if ext not in settings.ALLOWED_EXTENSIONS:
+        if ext not in settings.allowed_extensions_set:
             raise HTTPException(
                 status_code=422,
                 detail=f"File type '.{ext}' not allowed. Accepted: {settings.ALLOWED_EXTENSIONS}",
             )
 
-    if file.content_type and file.content_type not in settings.ALLOWED_MIME_TYPES:
+    if file.content_type and file.content_type not in settings.allowed_mime_types_set:
         raise HTTPException(
             status_code=422,
             detail=f"MIME type '{file.content_type}' not allowed.",
         )
 
 
-async def _save_upload(job_id: uuid.UUID, file: UploadFile) -> str:
-    """Save uploaded file via storage backend. Returns the saved path."""
-    storage = get_storage()
+async def _save_upload(job_id: uuid.UUID, file: UploadFile, storage: StorageBackend) -> str:
+    """Stream uploaded file to the storage backend. Returns the saved path."""
     filename = file.filename or "upload.audio"
 
-    content = await file.read()
-    if len(content) > settings.max_file_size_bytes:
+    # Stream in fixed-size chunks so memory stays bounded regardless of
+    # upload size; the backend aborts once max_bytes is exceeded.
+    try:
+        return storage.save_file_stream(
+            str(job_id),
+            filename,
+            file.file,
+            max_bytes=settings.max_file_size_bytes,
+        )
+    except ValueError:
         raise HTTPException(
             status_code=422,
             detail=f"File exceeds maximum size of {settings.MAX_FILE_SIZE_MB} MB.",
         )
 
-    return storage.save_file(str(job_id), filename, content)
-
 
 @router.post("", response_model=JobCreateResponse, status_code=201)
 async def create_job(
     request: Request,
+    background_tasks: BackgroundTasks,
     file: Optional[UploadFile] = File(None),
     youtube_url: Optional[str] = Form(None),
     title: Optional[str] = Form("Untitled"),
     bpm: Optional[int] = Form(None),
     webhook_url: Optional[str] = Form(None),
     db: AsyncSession = Depends(get_db),
+    storage: StorageBackend = Depends(get_storage_backend),
 ):
     """Create a new transcription job from file upload or YouTube URL."""
     user_id = _get_user_identifier(request)
 
+    # Reject oversize uploads from the declared Content-Length before the
+    # body is consumed; the streaming guard in _save_upload remains the
+    # backstop for clients that lie about the header
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit():
+        if int(content_length) > settings.max_file_size_bytes:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Request exceeds maximum size of {settings.MAX_FILE_SIZE_MB} MB.",
+            )
+
     # Must provide either file or youtube_url
     if file is None and youtube_url is None:
         raise HTTPException(
@@ -122,57 +197,153 @@ async def create_job(
             headers={"Retry-After": "30"},
         )
 
-    # Create job record
-    job = Job(
-        status=JobStatus.QUEUED,
-        progress=0,
-        input_type=input_type,
-        youtube_url=youtube_url,
-        original_filename=file.filename if file else None,
-        title=title or "Untitled",
-        bpm=bpm,
-        webhook_url=webhook_url,
-        user_identifier=user_id,
-        model_version=settings.MODEL_VERSION,
-        warnings=[],
-    )
+    # From here the slot is held — any failure before the job is queued
+    # must give it back, or a few bad uploads lock the user out until the
+    # key TTL expires
+    try:
+        # Create job record
+        job = Job(
+            status=JobStatus.QUEUED,
+            progress=0,
+            input_type=input_type,
+            youtube_url=youtube_url,
+            original_filename=file.filename if file else None,
+            title=title or "Untitled",
+            bpm=bpm,
+            webhook_url=webhook_url,
+            user_identifier=user_id,
+            model_version=settings.MODEL_VERSION,
+            warnings=[],
+        )
 
-    db.add(job)
-    await db.flush()
+        db.add(job)
+        await db.flush()
 
-    logger.info(
-        "job_created",
-        job_id=str(job.id),
-        input_type=input_type.value,
-        user=user_id,
-    )
+        logger.info(
+            "job_created",
+            job_id=str(job.id),
+            input_type=input_type.value,
+            user=user_id,
+        )
 
-    # Save uploaded file
-    if file is not None:
-        await _save_upload(job.id, file)
+        # Save uploaded file
+        if file is not None:
+            await _save_upload(job.id, file, storage)
+    except BaseException:
+        await release_concurrency_slot_async(user_id)
+        raise
 
-    # Dispatch Celery pipeline
-    dispatch_pipeline(str(job.id))
+    # Dispatch the Celery pipeline after the response (and the session
+    # commit) — the 201 is not gated on the broker round-trip
+    background_tasks.add_task(dispatch_pipeline, str(job.id))
 
     return JobCreateResponse(id=job.id, status="queued")
 
 
+TERMINAL_STATUSES = ("completed", "failed")
+
+# Compiled once at import — pydantic-core parses and validates the whole
+# hits list in Rust instead of a Python loop over HitData instances
+HITS_ADAPTER = TypeAdapter(list[HitData])
+
+
+@router.websocket("/{job_id}/ws")
+async def job_status_ws(
+    websocket: WebSocket,
+    job_id: uuid.UUID,
+):
+    """Push job status updates over WebSocket instead of HTTP polling.
+
+    Sends the current state once on connect, then forwards events the
+    Celery workers publish on the job's Redis channel until the job
+    reaches a terminal state. The HTTP polling route remains for clients
+    that can't upgrade.
+    """
+    import json
+
+    import redis.asyncio as aioredis
+
+    await websocket.accept()
+
+    r = aioredis.from_url(settings.REDIS_URL)
+    pubsub = r.pubsub()
+    # Subscribe before the DB snapshot — an event the worker publishes
+    # between the SELECT and the subscribe would otherwise be dropped,
+    # and if it was the terminal transition nothing further arrives on
+    # the channel and listen() blocks forever
+    await pubsub.subscribe(f"job:{job_id}")
+    try:
+        # Initial snapshot so clients don't miss transitions that happened
+        # before they connected. Scoped session, not Depends(get_db) — a
+        # dependency-injected session would hold its pooled connection for
+        # the whole socket lifetime while we block in pubsub.listen()
+        async with async_session_factory() as db:
+            result = await db.execute(
+                select(Job.status, Job.progress).where(Job.id == job_id)
+            )
+            row = result.first()
+
+        if row is None:
+            await websocket.close(code=4404, reason="Job not found")
+            return
+
+        status = row.status.value
+        await websocket.send_json(
+            {"job_id": str(job_id), "status": status, "progress": row.progress}
+        )
+        if status in TERMINAL_STATUSES:
+            await websocket.close()
+            return
+
+        async for message in pubsub.listen():
+            if message["type"] != "message":
+                continue
+            event = json.loads(message["data"])
+            await websocket.send_json(event)
+            if event.get("status") in TERMINAL_STATUSES:
+                await websocket.close()
+                break
+    except WebSocketDisconnect:
+        pass
+    finally:
+        await pubsub.unsubscribe(f"job:{job_id}")
+        await pubsub.aclose()
+        await r.aclose()
+
+
 @router.get("/{job_id}", response_model=JobStatusResponse)
 async def get_job_status(
     job_id: uuid.UUID,
+    request: Request,
     db: AsyncSession = Depends(get_db),
 ):
     """Poll job status."""
-    result = await db.execute(select(Job).where(Job.id == job_id))
-    job = result.scalar_one_or_none()
+    result = await db.execute(select(*STATUS_COLS).where(Job.id == job_id))
+    job = result.first()
 
     if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
 
+    # Workers publish intermediate progress to an ephemeral Redis hash
+    # instead of writing every tick to Postgres — merge it in while the
+    # job is still running
+    status = job.status.value
+    progress = job.progress
+    if status not in TERMINAL_STATUSES:
+        try:
+            live = await request.app.state.redis.hgetall(f"job:{job_id}:progress")
+            if live:
+                progress = int(live.get(b"progress", progress))
+                status = live.get(b"status", status)
+                if isinstance(status, bytes):
+                    status = status.decode()
+        except Exception:
+            pass
+
     return JobStatusResponse(
         id=job.id,
-        status=job.status.value,
-        progress=job.progress,
+        status=status,
+        progress=progress,
         created_at=job.created_at,
         updated_at=job.updated_at,
         title=job.title,
@@ -187,10 +358,11 @@ async def get_job_status(
 async def get_job_result(
     job_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
+    storage: StorageBackend = Depends(get_storage_backend),
 ):
     """Get completed job result with hit data and download URLs."""
-    result = await db.execute(select(Job).where(Job.id == job_id))
-    job = result.scalar_one_or_none()
+    result = await db.execute(select(*RESULT_COLS).where(Job.id == job_id))
+    job = result.first()
 
     if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
@@ -208,20 +380,20 @@ async def get_job_result(
     if job.result_pdf_path:
         download_urls["pdf"] = f"/api/v1/jobs/{job.id}/download/pdf"
 
-    # Load hits from JSON file produced by the prediction stage
-    import json
-    storage = get_storage()
+    # Load hits from JSON file produced by the prediction stage.
+    # HITS_ADAPTER parses the raw bytes straight into validated models in
+    # pydantic-core, with no intermediate dict pass.
     hits = []
+    hits_gz_path = storage.get_file_path(str(job.id), "hits.json.gz")
     hits_path = storage.get_file_path(str(job.id), "hits.json")
-    if storage.file_exists(hits_path):
-        try:
-            raw_hits = json.loads(storage.read_file(hits_path))
-            hits = [
-                HitData(time=h["time"], instrument=h["instrument"], velocity=h["velocity"])
-                for h in raw_hits
-            ]
-        except Exception:
-            pass  # Graceful — return empty hits if file is corrupt
+    try:
+        if storage.file_exists(hits_gz_path):
+            hits = HITS_ADAPTER.validate_json(storage.read_file_gzip(hits_gz_path))
+        elif storage.file_exists(hits_path):
+            # Pre-gzip artifact name, still readable for older jobs
+            hits = HITS_ADAPTER.validate_json(storage.read_file(hits_path))
+    except Exception:
+        pass  # Graceful — return empty hits if file is corrupt
 
     return JobResultResponse(
         id=job.id,
@@ -243,13 +415,15 @@ async def download_result(
     job_id: uuid.UUID,
     format: str,
     db: AsyncSession = Depends(get_db),
+    storage: StorageBackend = Depends(get_storage_backend),
 ):
     """Download result file (musicxml or pdf)."""
-    if format not in ("musicxml", "pdf"):
+    format_entry = DOWNLOAD_FORMATS.get(format)
+    if format_entry is None:
         raise HTTPException(status_code=422, detail="Format must be 'musicxml' or 'pdf'")
 
-    result = await db.execute(select(Job).where(Job.id == job_id))
-    job = result.scalar_one_or_none()
+    result = await db.execute(select(*DOWNLOAD_COLS).where(Job.id == job_id))
+    job = result.first()
 
     if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
@@ -260,23 +434,30 @@ async def download_result(
             detail=f"Job is not completed. Current status: {job.status.value}",
         )
 
-    if format == "musicxml":
-        file_path = job.result_musicxml_path
-        media_type = "application/vnd.recordare.musicxml+xml"
-        filename = f"{job.title}.musicxml"
-    else:
-        file_path = job.result_pdf_path
-        media_type = "application/pdf"
-        filename = f"{job.title}.pdf"
+    path_attr, media_type = format_entry
+    file_path = getattr(job, path_attr)
+    filename = f"{job.title}.{format}"
 
-    storage = get_storage()
     if not file_path or not storage.file_exists(file_path):
         raise HTTPException(status_code=404, detail=f"{format} file not found")
 
-    return FileResponse(
-        path=file_path,
+    # Local files go through FileResponse so uvicorn can use sendfile(2);
+    # S3 objects are streamed in chunks without buffering in the process
+    if settings.STORAGE_BACKEND == "local" or Path(file_path).exists():
+        return FileResponse(
+            path=file_path,
+            media_type=media_type,
+            filename=filename,
+        )
+
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    size = storage.file_size(file_path)
+    if size is not None:
+        headers["Content-Length"] = str(size)
+    return StreamingResponse(
+        storage.iter_file(file_path),
         media_type=media_type,
-        filename=filename,
+        headers=headers,
     )
 
 
@@ -286,25 +467,29 @@ async def delete_job(
     db: AsyncSession = Depends(get_db),
 ):
     """Cancel a queued/processing job or delete a completed job and its artifacts."""
-    result = await db.execute(select(Job).where(Job.id == job_id))
-    job = result.scalar_one_or_none()
+    # Single round-trip: delete the row and get back what we need to
+    # revoke the Celery task
+    result = await db.execute(
+        delete(Job)
+        .where(Job.id == job_id)
+        .returning(Job.celery_task_id, Job.status, Job.user_identifier)
+    )
+    row = result.first()
 
-    if job is None:
+    if row is None:
         raise HTTPException(status_code=404, detail="Job not found")
 
     # Cancel Celery task if still running
-    if job.status in (JobStatus.QUEUED, JobStatus.PROCESSING, JobStatus.SEPARATING_DRUMS, JobStatus.PREDICTING, JobStatus.TRANSCRIBING):
-        if job.celery_task_id:
-            celery_app.control.revoke(job.celery_task_id, terminate=True)
-            logger.info("job_cancelled", job_id=str(job.id), task_id=job.celery_task_id)
-
-    # Clean up artifacts
-    storage = get_storage()
-    deleted = storage.delete_job_artifacts(str(job.id))
-    if deleted > 0:
-        logger.info("job_artifacts_deleted", job_id=str(job.id), files=deleted)
-
-    # Delete from DB
-    await db.delete(job)
-
-    return JobDeleteResponse(id=job.id, message="Job deleted successfully")
+    if row.status in (JobStatus.QUEUED, JobStatus.PROCESSING, JobStatus.SEPARATING_DRUMS, JobStatus.PREDICTING, JobStatus.TRANSCRIBING):
+        if row.celery_task_id:
+            celery_app.control.revoke(row.celery_task_id, terminate=True)
+            logger.info("job_cancelled", job_id=str(job_id), task_id=row.celery_task_id)
+        # The worker errback never runs for a cancelled job — give the
+        # concurrency slot back here
+        await release_concurrency_slot_async(row.user_identifier)
+
+    # Artifact cleanup can involve many files or S3 round-trips — run it
+    # off the request path
+    cleanup_job_artifacts.delay(str(job_id))
+
+    return JobDeleteResponse(id=job_id, message="Job deleted successfully")
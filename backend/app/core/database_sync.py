@@ -1,5 +1,5 @@
 from sqlalchemy import create_engine
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.orm import Session, scoped_session, sessionmaker
 
 from app.core.config import settings
 
@@ -16,6 +16,12 @@ sync_engine = create_engine(
 
 SyncSessionFactory = sessionmaker(bind=sync_engine, class_=Session)
 
+# Thread-local session for the worker helpers' many small one-row
+# reads/writes — one session per worker thread instead of a fresh
+# open/query/commit/close cycle per call. Callers must end each unit of
+# work with commit() or rollback() so the connection returns to the pool.
+SyncScopedSession = scoped_session(SyncSessionFactory)
+
 
 def get_sync_db() -> Session:
     """Get a synchronous database session for use in Celery workers."""
@@ -1,10 +1,14 @@
 """
-Concurrency control — DB-based per-user job limits.
+Concurrency control — Redis-based per-user job limits.
 
-The API layer checks active job count via DB query in the POST /jobs route.
-This module provides helper utilities for concurrency enforcement.
+The API layer reserves a slot via an atomic check-and-increment Lua script
+on POST /jobs; Celery workers release the slot when a job reaches a
+terminal state. The DB COUNT query remains as a fallback if Redis is
+unavailable.
 """
 
+from typing import Optional
+
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -22,9 +26,62 @@ ACTIVE_STATUSES = [
     JobStatus.TRANSCRIBING,
 ]
 
+# TTL safety net — if a worker dies without releasing, the counter expires
+# instead of locking the user out forever.
+ACTIVE_JOBS_TTL_SECONDS = 3600
+
+# Atomic check-and-increment: returns 1 if a slot was reserved, 0 if the
+# user is already at the limit. Runs server-side so parallel POSTs cannot
+# both pass the check.
+_CHECK_AND_INCR_LUA = """
+local n = tonumber(redis.call('GET', KEYS[1]) or '0')
+if n >= tonumber(ARGV[1]) then
+    return 0
+end
+redis.call('INCR', KEYS[1])
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return 1
+"""
+
+# Decrement without going below zero (a stale/expired key must not wrap).
+_DECR_FLOOR_LUA = """
+local n = tonumber(redis.call('GET', KEYS[1]) or '0')
+if n > 0 then
+    redis.call('DECR', KEYS[1])
+end
+return 0
+"""
+
+_async_redis = None
+_sync_redis = None
+
+
+def _active_jobs_key(user_id: str) -> str:
+    return f"active_jobs:{user_id}"
+
+
+def _get_async_redis():
+    """Lazily create the shared async Redis client (API process)."""
+    global _async_redis
+    if _async_redis is None:
+        import redis.asyncio as aioredis
+
+        _async_redis = aioredis.from_url(settings.REDIS_URL)
+    return _async_redis
+
+
+def _get_sync_redis():
+    """Lazily create the shared sync Redis client (Celery workers)."""
+    global _sync_redis
+    if _sync_redis is None:
+        import redis
+
+        _sync_redis = redis.from_url(settings.REDIS_URL)
+    return _sync_redis
+
 
 async def get_active_job_count(db: AsyncSession, user_id: str) -> int:
-    """Count active (non-terminal) jobs for a user."""
+    """Count active (non-terminal) jobs for a user (DB fallback path)."""
     result = await db.execute(
         select(func.count(Job.id)).where(
             Job.user_identifier == user_id,
@@ -36,17 +93,70 @@ async def get_active_job_count(db: AsyncSession, user_id: str) -> int:
 
 async def check_concurrency_limit(db: AsyncSession, user_id: str) -> bool:
     """
-    Check if user is under the concurrency limit.
+    Atomically reserve a job slot for the user.
 
-    Returns True if a new job is allowed, False if limit exceeded.
+    Returns True if a new job is allowed (slot reserved), False if the
+    limit is exceeded. Falls back to the DB COUNT check if Redis is down.
     """
+    limit = settings.MAX_CONCURRENT_JOBS_PER_USER
+    try:
+        r = _get_async_redis()
+        allowed = await r.eval(
+            _CHECK_AND_INCR_LUA,
+            1,
+            _active_jobs_key(user_id),
+            limit,
+            ACTIVE_JOBS_TTL_SECONDS,
+        )
+        if not allowed:
+            logger.info("concurrency_limit_hit", user=user_id, limit=limit)
+            return False
+        return True
+    except Exception as e:
+        logger.warning("concurrency_redis_failed", user=user_id, error=str(e))
+
+    # Fallback — non-atomic, but better than rejecting all jobs
     count = await get_active_job_count(db, user_id)
-    if count >= settings.MAX_CONCURRENT_JOBS_PER_USER:
+    if count >= limit:
         logger.info(
             "concurrency_limit_hit",
             user=user_id,
             active=count,
-            limit=settings.MAX_CONCURRENT_JOBS_PER_USER,
+            limit=limit,
         )
         return False
     return True
+
+
+async def release_concurrency_slot_async(user_id: Optional[str]) -> None:
+    """
+    Release a user's job slot from the API process.
+
+    Async twin of release_concurrency_slot — used when a request fails
+    after the slot was reserved (upload/validation/DB errors) or when an
+    active job is deleted before a worker could release it. Never raises;
+    a missed release is covered by the key TTL.
+    """
+    if not user_id:
+        return
+    try:
+        r = _get_async_redis()
+        await r.eval(_DECR_FLOOR_LUA, 1, _active_jobs_key(user_id))
+    except Exception as e:
+        logger.warning("concurrency_release_failed", user=user_id, error=str(e))
+
+
+def release_concurrency_slot(user_id: Optional[str]) -> None:
+    """
+    Release a user's job slot when a job reaches a terminal state.
+
+    Sync — called from Celery workers. Never raises; a missed release is
+    covered by the key TTL.
+    """
+    if not user_id:
+        return
+    try:
+        r = _get_sync_redis()
+        r.eval(_DECR_FLOOR_LUA, 1, _active_jobs_key(user_id))
+    except Exception as e:
+        logger.warning("concurrency_release_failed", user=user_id, error=str(e))
@@ -2,8 +2,7 @@
 Observability setup — Prometheus metrics + OpenTelemetry tracing.
 """
 
-from prometheus_client import Counter, Histogram, Gauge, generate_latest, CONTENT_TYPE_LATEST
-from fastapi import Response
+from prometheus_client import Counter, Histogram, Gauge
 
 from app.utils.logging import get_logger
 
@@ -13,9 +12,19 @@ logger = get_logger(__name__)
 # Prometheus Metrics
 # ---------------------------------------------------------------------------
 
-INFERENCE_LATENCY = Histogram(
-    "inference_latency_seconds",
-    "Latency of each pipeline stage in seconds",
+# Stage latency is split by cost profile: every observation touches all
+# buckets of its histogram, so the cheap stages get a coarse histogram and
+# only the heavy inference stages pay for fine-grained buckets.
+FAST_STAGE_LATENCY = Histogram(
+    "fast_stage_latency_seconds",
+    "Latency of lightweight pipeline stages (ingest, transcription)",
+    labelnames=["stage"],
+    buckets=(0.1, 1.0, 10.0, 60.0),
+)
+
+SLOW_STAGE_LATENCY = Histogram(
+    "slow_stage_latency_seconds",
+    "Latency of heavy inference stages (separation, prediction)",
     labelnames=["stage"],
     buckets=(0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0),
 )
@@ -43,14 +52,6 @@ ACTIVE_JOBS_GAUGE = Gauge(
 )
 
 
-def metrics_response() -> Response:
-    """Generate Prometheus metrics response."""
-    return Response(
-        content=generate_latest(),
-        media_type=CONTENT_TYPE_LATEST,
-    )
-
-
 def setup_opentelemetry() -> None:
     """Configure OpenTelemetry tracing (optional — only if OTLP endpoint is set)."""
     from app.core.config import settings
@@ -2,10 +2,13 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+
+from prometheus_client import make_asgi_app
 
 from app.api.v1.router import api_v1_router
 from app.core.config import settings
-from app.core.telemetry import metrics_response, setup_opentelemetry
+from app.core.telemetry import setup_opentelemetry
 from app.utils.logging import setup_logging, get_logger
 
 
@@ -20,7 +23,22 @@ async def lifespan(app: FastAPI):
         version=settings.APP_VERSION,
     )
     setup_opentelemetry()
+
+    # Shared Redis client — health probes reuse this instead of paying a
+    # TCP handshake per request
+    import redis.asyncio as aioredis
+
+    app.state.redis = aioredis.from_url(settings.REDIS_URL, max_connections=10)
+
+    # Warm the storage backend singleton so the first request doesn't pay
+    # construction cost (boto3 client setup for S3)
+    from app.storage.backend import get_storage
+
+    get_storage()
+
     yield
+
+    await app.state.redis.aclose()
     logger.info("application_shutdown")
 
 
@@ -32,6 +50,7 @@ def create_app() -> FastAPI:
         docs_url="/docs",
         redoc_url="/redoc",
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
 
     # CORS
@@ -46,10 +65,9 @@ def create_app() -> FastAPI:
     # API routes
     app.include_router(api_v1_router)
 
-    # Prometheus metrics endpoint (outside /api/v1 prefix)
-    @app.get("/metrics", include_in_schema=False)
-    async def prometheus_metrics():
-        return metrics_response()
+    # Prometheus metrics endpoint (outside /api/v1 prefix) — mounted as a
+    # dedicated ASGI app so scrapes bypass the FastAPI router entirely
+    app.mount("/metrics", make_asgi_app())
 
     return app
 
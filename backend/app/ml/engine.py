@@ -10,6 +10,7 @@ Adapted for production use with singleton model loading and structured outputs.
 
 import multiprocessing
 import os
+from contextlib import nullcontext
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -18,16 +19,11 @@ import numpy as np
 import soundfile as sf
 
 from app.core.config import settings
+from app.ml.types import ANNOTEATOR_CLASSES, HitArray
 from app.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
-# ---------------------------------------------------------------------------
-# Instrument label mapping (AnNOTEator uses 6 classes)
-# Map from model output indices → our canonical instrument names
-# ---------------------------------------------------------------------------
-ANNOTEATOR_CLASSES = ["snare", "hihat_closed", "kick", "ride", "tom_high", "crash"]
-
 # Mel-spectrogram parameters — must match AnNOTEator training config exactly
 MEL_N_FFT = 2048
 MEL_HOP_LENGTH = 512
@@ -38,7 +34,89 @@ MEL_POWER = 2.0
 # Demucs model singleton (loaded once per worker process)
 _demucs_model = None
 _demucs_device = None
-# AnNOTEator order: SD, HH, KD, RC, TT, CC
+
+# Batched mel-spectrogram transform singleton (keyed on sample rate)
+_mel_transform = None
+_mel_transform_sr = None
+
+# madmom processor singletons — RNNBeatProcessor loads several NN weight
+# files on construction, so build once per worker like _demucs_model
+_madmom_beat_proc = None
+_madmom_tempo_proc = None
+
+
+def _load_demucs():
+    """Load the Demucs model singleton on CPU.
+
+    Called from preload_models in the worker parent before the prefork
+    pool forks, so the read-only weight pages are shared copy-on-write
+    across all pool children instead of loaded once per process. Device
+    placement and compilation stay in run_drum_separation — initializing
+    CUDA before fork would break the children.
+    """
+    global _demucs_model
+    if _demucs_model is None:
+        from demucs import pretrained
+
+        logger.info("demucs_loading_model")
+        _demucs_model = pretrained.get_model("htdemucs")
+        _demucs_model.eval()
+    return _demucs_model
+
+
+# Reused pinned host staging buffer for Demucs input (CUDA path)
+_pinned_buf = None
+
+
+def _pinned_staging(batch):
+    """Copy a (1, C, N) batch into a reused pinned host buffer.
+
+    The buffer is kept flat and grows to the largest track seen, so a
+    long-lived worker stops churning page-locked allocations of
+    ever-different sizes — the allocation pattern that fragments the
+    caching allocator over hundreds of jobs. Reshaping a flat prefix
+    (rather than slicing the last dim of a 3-D buffer) keeps the
+    returned view contiguous, which the async host-to-device copies
+    depend on.
+    """
+    global _pinned_buf
+    import torch
+
+    numel = batch.numel()
+    if (
+        _pinned_buf is None
+        or _pinned_buf.dtype != batch.dtype
+        or _pinned_buf.numel() < numel
+    ):
+        _pinned_buf = torch.empty(numel, dtype=batch.dtype, pin_memory=True)
+    view = _pinned_buf[:numel].view(batch.shape)
+    view.copy_(batch)
+    return view
+
+
+def _get_mel_transform(sr: int, device: str):
+    """Memoized torchaudio MelSpectrogram matching the AnNOTEator config.
+
+    Slaney mel scale/norm and constant padding replicate librosa's
+    defaults so the features match the training pipeline.
+    """
+    global _mel_transform, _mel_transform_sr
+    if _mel_transform is None or _mel_transform_sr != sr:
+        import torchaudio
+
+        _mel_transform = torchaudio.transforms.MelSpectrogram(
+            sample_rate=sr,
+            n_fft=MEL_N_FFT,
+            hop_length=MEL_HOP_LENGTH,
+            n_mels=MEL_N_MELS,
+            f_max=MEL_FMAX,
+            power=MEL_POWER,
+            pad_mode="constant",
+            norm="slaney",
+            mel_scale="slaney",
+        ).to(device)
+        _mel_transform_sr = sr
+    return _mel_transform
 
 
 def run_drum_separation(input_path: str, output_path: str) -> None:
@@ -53,12 +131,22 @@ def run_drum_separation(input_path: str, output_path: str) -> None:
 
     global _demucs_model, _demucs_device
 
-    if _demucs_model is None:
-        logger.info("demucs_loading_model")
-        _demucs_model = pretrained.get_model("htdemucs")
-        _demucs_model.eval()
+    if _demucs_device is None:
+        model = _load_demucs()
         _demucs_device = "cuda" if torch.cuda.is_available() else "cpu"
-        _demucs_model.to(_demucs_device)
+        if _demucs_device == "cuda":
+            # Per-process GPU copy is unavoidable; the CPU weight pages
+            # from the preload stay shared with the parent
+            model.to("cuda")
+            # split=True feeds the model identically-shaped chunks, so
+            # reduce-overhead mode can capture CUDA graphs and replay them
+            # per chunk, removing kernel-launch overhead. Fall back to the
+            # eager model if compilation is unsupported on this stack.
+            try:
+                _demucs_model = torch.compile(model, mode="reduce-overhead")
+                logger.info("demucs_model_compiled")
+            except Exception as e:
+                logger.warning("demucs_compile_failed", error=str(e))
     else:
         logger.info("demucs_using_cached_model")
 
@@ -74,25 +162,46 @@ def run_drum_separation(input_path: str, output_path: str) -> None:
         channels=model.audio_channels,
     )
 
-    # Normalize
-    ref = wav.mean(0)
-    wav = (wav - ref.mean()) / ref.std()
+    # Normalize in place — one torch.std_mean pass over the mono reference,
+    # then sub_/div_ so no full-song temporaries are materialized
+    ref_std, ref_mean = torch.std_mean(wav.mean(0))
+    wav.sub_(ref_mean).div_(ref_std)
 
-    # Apply model
+    # Apply model. The full mix stays on the CPU — apply_model(split=True)
+    # transfers one segment at a time to the device, so moving the whole
+    # track up front only pins VRAM for the duration of the job. Pinned host
+    # memory keeps the per-segment copies asynchronous.
     num_workers = min(multiprocessing.cpu_count(), 4)
-    sources = apply.apply_model(
-        model,
-        wav[None].to(device),
-        device=device,
-        shifts=1,
-        split=True,
-        overlap=0.25,
-        progress=True,
-        num_workers=num_workers,
-    )[0]
-
-    # Denormalize
-    sources = sources * ref.std() + ref.mean()
+    batch = wav[None]
+    if device == "cuda":
+        # Stage through the reused pinned buffer: page-locked memory is
+        # what lets the per-segment host-to-device copies inside
+        # apply_model run as asynchronous DMA instead of synchronous
+        # pageable copies
+        batch = _pinned_staging(batch)
+
+    # inference_mode skips autograd bookkeeping entirely; on GPU, autocast
+    # runs the separation in float16 for roughly double the throughput
+    amp = (
+        torch.autocast(device_type="cuda", dtype=torch.float16)
+        if device == "cuda"
+        else nullcontext()
+    )
+    with torch.inference_mode(), amp:
+        sources = apply.apply_model(
+            model,
+            batch,
+            device=device,
+            shifts=1,
+            split=True,
+            overlap=0.25,
+            progress=True,
+            num_workers=num_workers,
+        )[0]
+    sources = sources.float()
+
+    # Denormalize in place
+    sources = sources.mul_(ref_std).add_(ref_mean)
 
     # Extract drums (index 0 in htdemucs source order: drums, bass, other, vocals)
     drums = sources[0].cpu().numpy()
@@ -121,20 +230,27 @@ def run_drum_separation(input_path: str, output_path: str) -> None:
 def run_prediction(
     drums_path: str,
     user_bpm: Optional[int] = None,
+    audio: Optional[tuple] = None,
 ) -> Dict[str, Any]:
     """
     Run the full prediction pipeline on an isolated drum track.
 
     Replicates AnNOTEator's drum_to_frame() + predict_drumhit().
 
+    Pass a pre-decoded ``audio=(y, sr)`` tuple (e.g. from
+    validate_audio_signal) to skip re-decoding the file.
+
     Returns dict with:
         detected_bpm, bpm_unreliable, duration_seconds, confidence_score,
         hit_summary, hits (list of {time, instrument, velocity})
     """
     logger.info("prediction_pipeline_start", drums_path=drums_path)
 
-    # Load drum track
-    drum_track, sr = librosa.load(drums_path, sr=None, mono=True)
+    # Load drum track unless the caller already decoded it
+    if audio is not None:
+        drum_track, sr = audio
+    else:
+        drum_track, sr = librosa.load(drums_path, sr=None, mono=True)
     duration = librosa.get_duration(y=drum_track, sr=sr)
 
     # --- BPM Detection ---
@@ -151,10 +267,17 @@ def run_prediction(
     if detected_bpm > 110:
         hop_length = 512
 
+    # One full-track STFT total: onset_strength computes it, and detection
+    # runs purely on the returned envelope. Per-clip mel features are kept
+    # on their own clip-aligned FFT (below) rather than sliced out of this
+    # spectrogram — full-track frame boundaries don't line up with the
+    # onset windows the CNN was trained on.
     o_env = librosa.onset.onset_strength(y=drum_track, sr=sr, hop_length=hop_length)
-    onset_frames = librosa.onset.onset_detect(
-        y=drum_track, onset_envelope=o_env, sr=sr, hop_length=hop_length
-    )
+
+    # Jitted single-pass peak picker with onset_detect's default windows —
+    # same frames, no sliding-window temporaries
+    from app.ml._onset_peak_pick import pick_onset_frames
+    onset_frames = pick_onset_frames(o_env, sr=sr, hop_length=hop_length)
     onset_samples = librosa.frames_to_samples(onset_frames, hop_length=hop_length)
 
     if len(onset_samples) == 0:
@@ -166,40 +289,34 @@ def run_prediction(
             "confidence_score": 0.0,
             "hit_summary": {},
             "hits": [],
+            "hits_soa": HitArray(
+                times=np.empty(0),
+                velocities=np.empty(0),
+                instrument_idx=np.empty(0, dtype=np.intp),
+            ),
         }
 
-    # Calculate window size based on 16th note duration (AnNOTEator default resolution=16)
-    sixteenth_duration = 60 / detected_bpm / 4
+    # Lead-in before each onset, a quarter of a 32nd note (AnNOTEator's
+    # padding convention)
     thirty_second_duration = 60 / detected_bpm / 8
-    window_size = librosa.time_to_samples(sixteenth_duration, sr=sr)
     padding = librosa.time_to_samples(thirty_second_duration / 4, sr=sr)
 
-    # Extract audio clips for each onset
+    # Extract a fixed TARGET_LENGTH window around each onset — one
+    # fancy-index builds the (N, L) matrix with no Python loop. Slicing
+    # directly at the model's frame size makes every clip the right length
+    # by construction, so the old per-clip resample to TARGET_LENGTH is
+    # gone entirely; the mel transform still sees the native sample rate,
+    # so frequency content is unchanged.
     TARGET_LENGTH = 8820  # AnNOTEator's fixed frame size
-    clips = []
-    valid_onset_times = []
-
-    for onset in onset_samples:
-        start = max(0, int(onset - padding))
-        end = int(onset + window_size)
-        clip = drum_track[start:end]
-
-        if len(clip) == 0:
-            continue
-
-        # Resample to target length (AnNOTEator requirement)
-        if len(clip) != TARGET_LENGTH:
-            ratio = TARGET_LENGTH / len(clip)
-            clip = librosa.resample(clip, orig_sr=sr, target_sr=int(sr * ratio))
-            if len(clip) > TARGET_LENGTH:
-                clip = clip[:TARGET_LENGTH]
-            elif len(clip) < TARGET_LENGTH:
-                clip = np.pad(clip, (0, TARGET_LENGTH - len(clip)))
-
-        clips.append(clip)
-        valid_onset_times.append(librosa.samples_to_time(onset, sr=sr))
-
-    if len(clips) == 0:
+    start_idx = np.maximum(onset_samples.astype(np.intp) - padding, 0)
+
+    # Zero-pad the tail so windows running past the end stay in bounds
+    padded_track = np.pad(drum_track, (0, TARGET_LENGTH))
+    clips_arr = padded_track[start_idx[:, None] + np.arange(TARGET_LENGTH)[None, :]]
+    del padded_track
+    valid_onset_times = librosa.samples_to_time(onset_samples, sr=sr)
+
+    if clips_arr.shape[0] == 0:
         return {
             "detected_bpm": int(detected_bpm),
             "bpm_unreliable": bpm_unreliable,
@@ -207,63 +324,94 @@ def run_prediction(
             "confidence_score": 0.0,
             "hit_summary": {},
             "hits": [],
+            "hits_soa": HitArray(
+                times=np.empty(0),
+                velocities=np.empty(0),
+                instrument_idx=np.empty(0, dtype=np.intp),
+            ),
         }
 
     # --- Mel-Spectrogram Feature Extraction ---
-    mel_specs = []
-    for clip in clips:
-        mel = librosa.feature.melspectrogram(
-            y=clip, sr=sr, n_fft=MEL_N_FFT, hop_length=MEL_HOP_LENGTH,
-            n_mels=MEL_N_MELS, fmax=MEL_FMAX, power=MEL_POWER,
+    # One batched torch STFT over all clips instead of N librosa calls —
+    # a single (cu)FFT launch replaces per-clip Python dispatch. torch is
+    # a worker-image dependency; environments without it (API image, test
+    # runs) take the equally batched librosa path below.
+    try:
+        import torch
+    except ImportError:
+        torch = None
+
+    if torch is not None:
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+        mel_xform = _get_mel_transform(sr, device)
+        clips_t = torch.from_numpy(clips_arr.astype(np.float32)).to(device)
+        # inference_mode over no_grad — no autograd state at all. The mel
+        # FFT stays in float32; half precision there would shift features
+        # away from the training distribution
+        with torch.inference_mode():
+            X = mel_xform(clips_t).cpu().numpy()
+        del clips_t
+    else:
+        # Multichannel melspectrogram: one call over the (N, L) clip
+        # matrix with the same parameters as the torchaudio transform
+        X = librosa.feature.melspectrogram(
+            y=clips_arr.astype(np.float32),
+            sr=sr,
+            n_fft=MEL_N_FFT,
+            hop_length=MEL_HOP_LENGTH,
+            n_mels=MEL_N_MELS,
+            fmax=MEL_FMAX,
+            power=MEL_POWER,
         )
-        mel_specs.append(mel)
 
     # Free raw audio and clips — no longer needed after mel extraction
-    del drum_track, clips, o_env, onset_frames, onset_samples
+    del drum_track, clips_arr, o_env, onset_frames, onset_samples
 
-    X = np.array(mel_specs)
-    del mel_specs
     X = X.reshape(X.shape[0], X.shape[1], X.shape[2], 1)
 
     # --- CNN Prediction ---
     from app.ml.registry import get_model_resolver
     resolver = get_model_resolver()
-    model = resolver.get_keras_model()
 
-    pred_raw = model.predict(X, verbose=0)
-    pred_rounded = np.round(pred_raw)
+    pred_raw = resolver.predict(X)
 
-    # AnNOTEator logic: if all zeros, pick argmax
-    results = []
-    for i in range(pred_raw.shape[0]):
-        prediction = pred_rounded[i]
-        if prediction.sum() == 0:
-            raw = pred_raw[i]
-            new = np.zeros(len(ANNOTEATOR_CLASSES))
-            new[raw.argmax()] = 1
-            results.append(new)
-        else:
-            results.append(prediction)
+    # AnNOTEator's round-to-nearest is just a 0.5 threshold — a boolean mask
+    # selects the same hits without materializing a second float array
+    pred_mask = pred_raw >= 0.5
 
-    results = np.array(results)
+    # If a row clears the threshold nowhere, force its argmax class via one
+    # fancy-indexed assignment
+    empty_rows = ~pred_mask.any(axis=1)
+    if empty_rows.any():
+        pred_mask[empty_rows, pred_raw[empty_rows].argmax(axis=1)] = True
 
     # --- Build hits list and summary ---
-    hits: List[Dict[str, Any]] = []
-    hit_counts: Dict[str, int] = {name: 0 for name in ANNOTEATOR_CLASSES}
-
-    for i, onset_time in enumerate(valid_onset_times):
-        for j, instrument in enumerate(ANNOTEATOR_CLASSES):
-            if results[i][j] == 1:
-                velocity = float(pred_raw[i][j])
-                hits.append({
-                    "time": round(float(onset_time), 4),
-                    "instrument": instrument,
-                    "velocity": round(velocity, 4),
-                })
-                hit_counts[instrument] += 1
-
-    # Filter out instruments with zero hits
-    hit_summary = {k: v for k, v in hit_counts.items() if v > 0}
+    # np.nonzero yields every (onset, class) pair in one pass, replacing the
+    # nested Python loop over the full N x 6 prediction matrix. The three
+    # flat arrays are the canonical structure-of-arrays form of the hit
+    # list; the dict list is derived from them for API/DB compatibility.
+    row_idx, col_idx = np.nonzero(pred_mask)
+    hit_times = valid_onset_times[row_idx]
+    hit_velocities = pred_raw[row_idx, col_idx]
+    # One branchless SIMD pass clamps every velocity into the API's [0, 1]
+    # contract — quantized/TFLite backends can overshoot the sigmoid range
+    # slightly, and a per-hit Python min/max would mispredict near the edges
+    np.clip(hit_velocities, 0.0, 1.0, out=hit_velocities)
+    hits: List[Dict[str, Any]] = [
+        {
+            "time": round(float(t), 4),
+            "instrument": ANNOTEATOR_CLASSES[c],
+            "velocity": round(float(v), 4),
+        }
+        for t, c, v in zip(hit_times, col_idx, hit_velocities)
+    ]
+
+    # bincount over the class column gives the per-instrument totals;
+    # instruments with zero hits are dropped as before
+    counts = np.bincount(col_idx, minlength=len(ANNOTEATOR_CLASSES))
+    hit_summary = {
+        name: int(n) for name, n in zip(ANNOTEATOR_CLASSES, counts) if n > 0
+    }
 
     # --- Confidence Scoring ---
     mean_confidence = float(np.mean(pred_raw.max(axis=1)))
@@ -285,6 +433,14 @@ def run_prediction(
         "confidence_score": confidence_score,
         "hit_summary": hit_summary,
         "hits": hits,
+        # Structure-of-arrays view of the same hits for in-process
+        # consumers — contiguous arrays instead of ~200 bytes/hit of dicts.
+        # Not persisted; the worker stores only the dict list.
+        "hits_soa": HitArray(
+            times=hit_times,
+            velocities=hit_velocities,
+            instrument_idx=col_idx,
+        ),
     }
 
 
@@ -296,11 +452,18 @@ def _detect_bpm(drum_track: np.ndarray, sr: int) -> tuple[float, bool]:
     bpm_unreliable = False
 
     # Try madmom first
+    global _madmom_beat_proc, _madmom_tempo_proc
     try:
         import madmom
-        proc = madmom.features.tempo.TempoEstimationProcessor(fps=100)
-        act = madmom.features.beats.RNNBeatProcessor()(drum_track)
-        tempi = proc(act)
+        if _madmom_beat_proc is None:
+            _madmom_beat_proc = madmom.features.beats.RNNBeatProcessor(
+                num_threads=min(4, os.cpu_count())
+            )
+            _madmom_tempo_proc = madmom.features.tempo.TempoEstimationProcessor(
+                fps=100
+            )
+        act = _madmom_beat_proc(drum_track)
+        tempi = _madmom_tempo_proc(act)
         if len(tempi) > 0:
             bpm = float(tempi[0][0])
             strength = float(tempi[0][1])
@@ -0,0 +1,153 @@
+"""
+Signal-processing utilities shared by the prediction pipeline.
+
+Small, pure functions over clip-sized arrays. The RMS reduction is
+numba-jitted: for onset-window clips the NumPy expression
+``sqrt(mean(y**2))`` spends more time in call dispatch and the ``y**2``
+temporary than in the math, while the compiled scan allocates nothing.
+numba ships as a librosa dependency, so no new requirement is introduced.
+"""
+
+import math
+import os
+
+import librosa
+import numpy as np
+from numba import njit
+
+# AnNOTEator's fixed frame size — every clip fed to the CNN is this many
+# samples long (0.2 s at 44.1 kHz).
+FRAME_TARGET_LENGTH = 8820
+
+# STFT parameters matching the engine's mel config (n_fft/hop/n_mels)
+_STFT_N_FFT = 2048
+_STFT_HOP = 512
+# Periodic Hann, as librosa uses for its STFT
+_STFT_WINDOW = np.hanning(_STFT_N_FFT + 1)[:-1].astype(np.float32)
+
+# Mel filterbanks keyed by (sr, n_mels) — librosa rebuilds the full
+# (n_mels, n_fft/2+1) filterbank inside every melspectrogram call; for
+# fixed-size clips that construction rivals the FFT itself
+_MEL_FB_CACHE: dict = {}
+
+
+def _mel_filterbank(sr: int, n_mels: int) -> np.ndarray:
+    key = (sr, n_mels)
+    fb = _MEL_FB_CACHE.get(key)
+    if fb is None:
+        fb = librosa.filters.mel(sr=sr, n_fft=_STFT_N_FFT, n_mels=n_mels).astype(
+            np.float32
+        )
+        _MEL_FB_CACHE[key] = fb
+    return fb
+
+
+@njit(cache=True, fastmath=True)
+def _rms_kernel(y: np.ndarray) -> float:
+    s = 0.0
+    for v in y:
+        s += v * v
+    return math.sqrt(s / y.shape[0])
+
+
+def compute_rms(y: np.ndarray) -> float:
+    """Root-mean-square amplitude of a signal.
+
+    Single compiled pass — no ``y**2`` temporary, no intermediate mean
+    array. Used for per-clip velocity estimation.
+    """
+    return _rms_kernel(np.ascontiguousarray(y))
+
+
+def resample_clip_to_target(clip: np.ndarray, sr: int) -> np.ndarray:
+    """Fit a clip to FRAME_TARGET_LENGTH samples.
+
+    Shorter clips are zero-padded at the tail, longer clips trimmed —
+    the same convention as AnNOTEator's drum_to_frame windows, so the
+    mel transform always sees a fixed-size input. One zeroed output
+    buffer and one copy; fix_length-style pad/concatenate would build an
+    extra temporary per clip.
+    """
+    out = np.zeros(FRAME_TARGET_LENGTH, dtype=np.float32)
+    n = min(clip.shape[0], FRAME_TARGET_LENGTH)
+    out[:n] = clip[:n]
+    return out
+
+
+def compute_mel_spectrogram(clip: np.ndarray, sr: int, n_mels: int = 128) -> np.ndarray:
+    """Mel power spectrogram of a single clip, shape (n_mels, frames).
+
+    Power scale (not dB) to match the CNN's training features; a silent
+    clip maps to an all-zero spectrogram. Set DRUMSCRIBE_USE_TORCHAUDIO=1
+    to route through the engine's torchaudio transform instead — same
+    (n_mels, frames) output, but the FFT runs on GPU when one is present.
+    """
+    if os.environ.get("DRUMSCRIBE_USE_TORCHAUDIO") == "1":
+        return compute_mel_spectrogram_torch(clip, sr, n_mels=n_mels)
+
+    # Hand-rolled STFT against the cached filterbank: strided view over
+    # the clip (no frame copies), one batched rfft, one dense matmul.
+    # librosa.feature.melspectrogram rebuilds the filterbank and window
+    # per call, which dominates for FRAME_TARGET_LENGTH-sized inputs.
+    clip = np.ascontiguousarray(clip, dtype=np.float32)
+    if clip.shape[0] < _STFT_N_FFT:
+        clip = np.pad(clip, (0, _STFT_N_FFT - clip.shape[0]))
+    frames = np.lib.stride_tricks.sliding_window_view(clip, _STFT_N_FFT)[::_STFT_HOP]
+    power = np.abs(np.fft.rfft(frames * _STFT_WINDOW, axis=1)) ** 2
+    return _mel_filterbank(sr, n_mels) @ power.T.astype(np.float32)
+
+
+# torchaudio transforms keyed by (sr, n_mels) — separate from the
+# engine's transform because this one must be non-centered to stay
+# frame-compatible with the strided NumPy path above
+_TORCH_MEL_CACHE: dict = {}
+
+
+def compute_mel_spectrogram_torch(
+    clip: np.ndarray, sr: int, n_mels: int = 128
+) -> np.ndarray:
+    """Mel power spectrogram via a cached torchaudio transform.
+
+    Built with center=False and the same n_fft/hop/window as the NumPy
+    path, so both backends produce the same (n_mels, frames) shape for a
+    given clip — switching DRUMSCRIBE_USE_TORCHAUDIO must not change
+    what the model sees. Slaney scale/norm matches the cached librosa
+    filterbank; the FFT runs on GPU when one is present.
+    """
+    import torch
+    import torchaudio
+
+    key = (sr, n_mels)
+    xform = _TORCH_MEL_CACHE.get(key)
+    if xform is None:
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+        xform = torchaudio.transforms.MelSpectrogram(
+            sample_rate=sr,
+            n_fft=_STFT_N_FFT,
+            hop_length=_STFT_HOP,
+            n_mels=n_mels,
+            center=False,
+            power=2.0,
+            norm="slaney",
+            mel_scale="slaney",
+        ).to(device)
+        _TORCH_MEL_CACHE[key] = xform
+    device = next(iter(xform.buffers())).device
+    with torch.inference_mode():
+        t = torch.from_numpy(np.ascontiguousarray(clip, dtype=np.float32)).to(device)
+        return xform(t).cpu().numpy()
+
+
+def compute_mel_spectrogram_batch(
+    clips: np.ndarray, sr: int, n_mels: int = 128
+) -> np.ndarray:
+    """Mel power spectrograms for a stack of clips, shape (N, n_mels, frames).
+
+    One call over the (N, FRAME_TARGET_LENGTH) matrix — librosa treats
+    the leading axis as channels, so the STFT window, FFT plan and mel
+    filterbank matmul are amortized across all clips instead of paid N
+    times. The engine's CUDA-capable torchaudio path covers the hot
+    pipeline; this is the NumPy-only equivalent for callers without
+    torch in scope.
+    """
+    return librosa.feature.melspectrogram(y=clips, sr=sr, n_mels=n_mels)
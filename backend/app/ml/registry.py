@@ -7,6 +7,7 @@ Provides a singleton interface so models are loaded once at worker startup.
 import os
 import hashlib
 import shutil
+import threading
 from pathlib import Path
 from typing import Optional
 from urllib.parse import urlparse
@@ -17,6 +18,32 @@ from app.utils.logging import get_logger
 logger = get_logger(__name__)
 
 
+class _TFLitePredictor:
+    """Wraps a tf.lite.Interpreter behind the Keras model.predict interface.
+
+    Lets run_prediction stay agnostic to whether the CNN runs as a full
+    Keras model or a quantized TFLite flatbuffer.
+    """
+
+    def __init__(self, model_path: str):
+        import tensorflow as tf
+
+        self._interpreter = tf.lite.Interpreter(model_path=model_path)
+        self._input_index = self._interpreter.get_input_details()[0]["index"]
+        self._output_index = self._interpreter.get_output_details()[0]["index"]
+
+    def predict(self, X, verbose: int = 0):
+        import numpy as np
+
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        interp = self._interpreter
+        interp.resize_tensor_input(self._input_index, X.shape)
+        interp.allocate_tensors()
+        interp.set_tensor(self._input_index, X)
+        interp.invoke()
+        return interp.get_tensor(self._output_index)
+
+
 class ModelResolver:
     """
     Resolves and caches ML models by name and version.
@@ -39,6 +66,42 @@ class ModelResolver:
         self.model_version = model_version or settings.MODEL_VERSION
         self.model_sha256 = model_sha256 or settings.MODEL_SHA256
         self._keras_model = None
+        self._predict_fn = None
+        self._prefetch: Optional[threading.Thread] = None
+        self._prefetch_error: Optional[BaseException] = None
+        self._prefetch_digest: Optional[str] = None
+        self._start_prefetch()
+
+    def _cached_path(self, name: str, version: str) -> Path:
+        """Local cache path for a model, creating the versioned directory."""
+        versioned_dir = self.cache_dir / name / version
+        versioned_dir.mkdir(parents=True, exist_ok=True)
+        return versioned_dir / Path(self.model_uri).name
+
+    def _start_prefetch(self) -> None:
+        """Start pulling the default model in a background thread.
+
+        A cold worker overlaps the weight download with the rest of its
+        startup instead of serializing it inside the first get_model call.
+        No-op when the file is already cached.
+        """
+        cached_path = self._cached_path("complete_network", self.model_version)
+        if cached_path.exists() and cached_path.stat().st_size > 0:
+            return
+
+        def _pull() -> None:
+            try:
+                self._prefetch_digest = self._pull_model(
+                    self.model_uri, str(cached_path)
+                )
+            except BaseException as e:  # surfaced on join in get_model
+                self._prefetch_error = e
+
+        self._prefetch = threading.Thread(
+            target=_pull, name="model-prefetch", daemon=True
+        )
+        self._prefetch.start()
+        logger.info("model_prefetch_started", uri=self.model_uri)
 
     def get_model(self, name: str = "complete_network", version: str = "latest") -> str:
         """
@@ -49,12 +112,23 @@ class ModelResolver:
         if version == "latest":
             version = self.model_version
 
-        versioned_dir = self.cache_dir / name / version
-        versioned_dir.mkdir(parents=True, exist_ok=True)
-
-        # Determine expected filename from URI
-        filename = Path(self.model_uri).name
-        cached_path = versioned_dir / filename
+        cached_path = self._cached_path(name, version)
+
+        # Wait for any in-flight background pull before consulting the cache;
+        # a failed prefetch falls through to the synchronous pull below
+        if self._prefetch is not None:
+            self._prefetch.join()
+            self._prefetch = None
+            if self._prefetch_error is not None:
+                logger.warning(
+                    "model_prefetch_failed", error=str(self._prefetch_error)
+                )
+                self._prefetch_error = None
+            elif cached_path.exists():
+                self._verify_integrity(
+                    str(cached_path), actual_hex=self._prefetch_digest
+                )
+                self._prefetch_digest = None
 
         if cached_path.exists() and cached_path.stat().st_size > 0:
             logger.info(
@@ -72,16 +146,20 @@ class ModelResolver:
             version=version,
             uri=self.model_uri,
         )
-        self._pull_model(self.model_uri, str(cached_path))
-        self._verify_integrity(str(cached_path))
+        digest = self._pull_model(self.model_uri, str(cached_path))
+        self._verify_integrity(str(cached_path), actual_hex=digest)
         return str(cached_path)
 
-    def _pull_model(self, uri: str, dest: str) -> None:
-        """Download or copy model from URI to local cache."""
+    def _pull_model(self, uri: str, dest: str) -> Optional[str]:
+        """Download or copy model from URI to local cache.
+
+        Returns the SHA256 hex digest when it could be computed while
+        streaming (HTTP), else None.
+        """
         parsed = urlparse(uri)
 
         if parsed.scheme in ("http", "https"):
-            self._download_http(uri, dest)
+            return self._download_http(uri, dest)
         elif parsed.scheme == "s3":
             self._download_s3(uri, dest)
         elif parsed.scheme in ("", "file"):
@@ -93,30 +171,55 @@ class ModelResolver:
             logger.info("model_copied_local", src=src, dest=dest)
         else:
             raise ValueError(f"Unsupported model URI scheme: {parsed.scheme}")
+        return None
 
-    def _download_http(self, url: str, dest: str) -> None:
-        """Download model from HTTP/HTTPS URL."""
+    def _download_http(self, url: str, dest: str) -> str:
+        """Download model from HTTP/HTTPS URL, hashing while streaming.
+
+        Hashing inside the chunk loop means integrity verification needs no
+        second pass over the file — on a cold start the old re-read cost a
+        full extra read of the model from disk.
+        """
         import httpx
 
         logger.info("model_downloading_http", url=url)
-        with httpx.stream("GET", url, follow_redirects=True, timeout=300) as response:
-            response.raise_for_status()
-            with open(dest, "wb") as f:
-                for chunk in response.iter_bytes(chunk_size=8192):
-                    f.write(chunk)
+        sha256 = hashlib.sha256()
+        # Stream to a .part file and rename on success — a crash mid-download
+        # can't leave a truncated file at dest that would satisfy the cache
+        # check on the next start (same atomic pattern as the Demucs output
+        # save in app.ml.engine)
+        tmp = dest + ".part"
+        try:
+            with httpx.stream(
+                "GET", url, follow_redirects=True, timeout=300
+            ) as response:
+                response.raise_for_status()
+                with open(tmp, "wb") as f:
+                    for chunk in response.iter_bytes(chunk_size=8192):
+                        sha256.update(chunk)
+                        f.write(chunk)
+            os.replace(tmp, dest)
+        except Exception:
+            Path(tmp).unlink(missing_ok=True)
+            raise
         logger.info("model_downloaded", dest=dest, size=os.path.getsize(dest))
+        return sha256.hexdigest()
+
+    def _verify_integrity(self, path: str, actual_hex: Optional[str] = None) -> None:
+        """Verify SHA256 checksum of downloaded model if MODEL_SHA256 is set.
 
-    def _verify_integrity(self, path: str) -> None:
-        """Verify SHA256 checksum of downloaded model if MODEL_SHA256 is set."""
+        A digest computed while streaming the download is accepted directly;
+        otherwise the file is hashed with hashlib.file_digest, which reads
+        through a zero-copy buffer with the GIL released.
+        """
         if not self.model_sha256:
             logger.info("model_sha256_skip", reason="MODEL_SHA256 not configured")
             return
 
-        sha256 = hashlib.sha256()
-        with open(path, "rb") as f:
-            for chunk in iter(lambda: f.read(8192), b""):
-                sha256.update(chunk)
-        actual = sha256.hexdigest()
+        if actual_hex is None:
+            with open(path, "rb") as f:
+                actual_hex = hashlib.file_digest(f, "sha256").hexdigest()
+        actual = actual_hex
 
         if actual != self.model_sha256:
             Path(path).unlink(missing_ok=True)
@@ -144,17 +247,113 @@ class ModelResolver:
         logger.info("model_downloaded", dest=dest, size=os.path.getsize(dest))
 
     def get_keras_model(self, name: str = "complete_network", version: str = "latest"):
-        """Load and cache the Keras CNN model (singleton)."""
+        """Load and cache the CNN model (singleton).
+
+        Per MODEL_QUANTIZATION, the FP32 Keras model is converted once to a
+        quantized TFLite flatbuffer (cached beside the .h5, keyed by mode)
+        and served via a tf.lite.Interpreter — int8 dynamic-range roughly
+        halves memory bandwidth again over float16 on CPU, with no
+        retraining. Falls back to the plain Keras model if conversion is
+        unavailable or disabled.
+        """
         if self._keras_model is not None:
             return self._keras_model
 
         model_path = self.get_model(name, version)
+        mode = settings.MODEL_QUANTIZATION.lower()
+
+        if mode in ("int8", "float16"):
+            try:
+                self._keras_model = _TFLitePredictor(
+                    self._quantize(model_path, mode)
+                )
+                logger.info(
+                    "keras_model_loaded", path=model_path, backend=f"tflite_{mode}"
+                )
+                return self._keras_model
+            except Exception as e:
+                logger.warning("model_quantization_failed", error=str(e))
 
         from tensorflow import keras
+
         self._keras_model = keras.models.load_model(model_path)
-        logger.info("keras_model_loaded", path=model_path)
+        logger.info("keras_model_loaded", path=model_path, backend="keras")
         return self._keras_model
 
+    def _quantize(self, model_path: str, mode: str) -> str:
+        """Convert the Keras model to a quantized TFLite flatbuffer, cached on disk.
+
+        "int8" uses dynamic-range quantization (int8 weights, activations
+        quantized on the fly — no calibration set needed); "float16" keeps
+        weights in half precision.
+        """
+        tflite_path = Path(model_path).with_suffix(f".{mode}.tflite")
+        if tflite_path.exists() and tflite_path.stat().st_size > 0:
+            logger.info("tflite_cache_hit", path=str(tflite_path))
+            return str(tflite_path)
+
+        import tensorflow as tf
+
+        model = tf.keras.models.load_model(model_path)
+        converter = tf.lite.TFLiteConverter.from_keras_model(model)
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        if mode == "float16":
+            converter.target_spec.supported_types = [tf.float16]
+        tflite_path.write_bytes(converter.convert())
+        logger.info(
+            "model_quantized",
+            mode=mode,
+            path=str(tflite_path),
+            size=tflite_path.stat().st_size,
+        )
+        return str(tflite_path)
+
+    def predict(self, X):
+        """Run the CNN on a batch without Keras' predict() machinery.
+
+        model.predict carries per-call callback dispatch and an internal
+        batching loop that can outweigh the conv math for a few hundred
+        clips. The TFLite path already invokes the interpreter directly; the
+        Keras fallback goes through a tf.function traced exactly once with a
+        dynamic batch dimension.
+        """
+        model = self.get_keras_model()
+        if not callable(model) or isinstance(model, _TFLitePredictor):
+            # TFLite interpreter wrapper, or a plain object exposing only
+            # .predict (test doubles) — no tracing possible or needed
+            return model.predict(X, verbose=0)
+
+        import tensorflow as tf
+
+        if self._predict_fn is None:
+            # Dynamic batch dimension so one trace serves every track; XLA
+            # (jit_compile=True) is left off deliberately — it specializes
+            # per concrete shape, and onset counts vary per job, so it
+            # would recompile instead of reuse
+            self._predict_fn = tf.function(
+                lambda x: model(x, training=False),
+                input_signature=[
+                    tf.TensorSpec([None, *X.shape[1:]], tf.float32)
+                ],
+            )
+        return self._predict_fn(tf.convert_to_tensor(X, tf.float32)).numpy()
+
+    def predict_batch(self, X):
+        """Alias for predict() — the batched forward pass without Keras'
+        predict() machinery. Kept as a separate name so callers and tests
+        can hand in anything with this method in place of a resolver."""
+        return self.predict(X)
+
+    def invalidate(self) -> None:
+        """Drop the cached in-memory model and traced predict function.
+
+        Resolved files stay on disk; the next get_keras_model() reloads
+        from the cache directory. Exists so tests can reset state between
+        resolver patches without respawning the process.
+        """
+        self._keras_model = None
+        self._predict_fn = None
+
     @property
     def version(self) -> str:
         return self.model_version
@@ -175,10 +374,26 @@ def get_model_resolver() -> ModelResolver:
     return _resolver
 
 
+def invalidate_model_resolver() -> None:
+    """Discard the singleton (and its cached model) entirely.
+
+    Test hook — production code never calls this; the whole point of the
+    singleton is that the Keras load happens once per worker process.
+    """
+    global _resolver
+    if _resolver is not None:
+        _resolver.invalidate()
+    _resolver = None
+
+
 def preload_models() -> None:
     """
     Preload models at worker startup.
-    Called from worker_init signal handler.
+
+    Called from the worker_init signal handler, which runs in the worker
+    parent before the prefork pool forks — weights resident here are
+    shared copy-on-write across all pool children, so an N-process worker
+    holds one copy of each model instead of N.
     """
     resolver = get_model_resolver()
     try:
@@ -186,3 +401,10 @@ def preload_models() -> None:
         logger.info("models_preloaded")
     except Exception as e:
         logger.error("model_preload_failed", error=str(e))
+
+    try:
+        from app.ml.engine import _load_demucs
+
+        _load_demucs()
+    except Exception as e:
+        logger.error("demucs_preload_failed", error=str(e))
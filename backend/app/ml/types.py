@@ -0,0 +1,45 @@
+"""
+Shared hit-data types for the ML pipeline.
+
+Lives in its own module (no librosa/torch imports) so services can use
+the structure-of-arrays hit representation without pulling the full
+engine stack into their import graph.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+import numpy as np
+
+# Instrument label mapping (AnNOTEator uses 6 classes) — model output
+# index → canonical instrument name, in AnNOTEator order: SD, HH, KD,
+# RC, TT, CC
+ANNOTEATOR_CLASSES = ["snare", "hihat_closed", "kick", "ride", "tom_high", "crash"]
+
+
+@dataclass
+class HitArray:
+    """Structure-of-arrays view of a hit list.
+
+    Three parallel arrays instead of ~200 bytes of dict per hit; sorting
+    and grouping simultaneous hits become single vectorized passes over
+    contiguous memory. Instrument indices map through ANNOTEATOR_CLASSES.
+    """
+
+    times: np.ndarray
+    velocities: np.ndarray
+    instrument_idx: np.ndarray
+
+    def __len__(self) -> int:
+        return self.times.shape[0]
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Materialize the list-of-dicts form for API/DB serialization."""
+        return [
+            {
+                "time": round(float(t), 4),
+                "instrument": ANNOTEATOR_CLASSES[c],
+                "velocity": round(float(v), 4),
+            }
+            for t, c, v in zip(self.times, self.instrument_idx, self.velocities)
+        ]
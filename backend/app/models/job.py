@@ -7,13 +7,15 @@ from sqlalchemy import (
     DateTime,
     Enum,
     Float,
+    Index,
     Integer,
     String,
     Boolean,
     Text,
     func,
+    text,
 )
-from sqlalchemy.dialects.postgresql import UUID, JSON
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 
 from app.core.database import Base
 
@@ -35,6 +37,17 @@ class InputType(str, enum.Enum):
 
 class Job(Base):
     __tablename__ = "jobs"
+    __table_args__ = (
+        # Partial index backing the per-user concurrency-limit count
+        Index(
+            "ix_jobs_user_active",
+            "user_identifier",
+            postgresql_where=text(
+                "status IN ('QUEUED', 'PROCESSING', 'SEPARATING_DRUMS', "
+                "'PREDICTING', 'TRANSCRIBING')"
+            ),
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     status = Column(
@@ -77,9 +90,11 @@ class Job(Base):
     result_pdf_path = Column(String(512), nullable=True)
 
     # ML results
-    hit_summary = Column(JSON, nullable=True)
+    # JSONB stores the parsed binary form — no re-parse on every
+    # status/result read, and summary fields stay indexable
+    hit_summary = Column(JSONB, nullable=True)
     confidence_score = Column(Float, nullable=True)
-    warnings = Column(JSON, nullable=True, default=list)
+    warnings = Column(JSONB, nullable=True, default=list)
 
     # Performance
     compute_time_ms = Column(Integer, nullable=True)
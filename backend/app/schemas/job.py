@@ -1,9 +1,18 @@
+import re
 import uuid
 from datetime import datetime
 from typing import Dict, List, Optional
 
 from pydantic import BaseModel, Field, HttpUrl, field_validator
 
+# Compiled once at import — the validator sits on the request-admission path.
+# re.ASCII keeps \w to [A-Za-z0-9_], matching YouTube video IDs exactly and
+# skipping the Unicode property lookup per character
+_YT_RE = re.compile(
+    r"^(https?://)?(www\.)?(youtube\.com/(watch\?v=|embed/|v/|shorts/)|youtu\.be/)[\w\-]+",
+    re.ASCII,
+)
+
 
 class JobCreate(BaseModel):
     """Schema for creating a new transcription job."""
@@ -18,10 +27,7 @@ class JobCreate(BaseModel):
     def validate_youtube_url(cls, v: Optional[str]) -> Optional[str]:
         if v is None:
             return v
-        import re
-
-        pattern = r"^(https?://)?(www\.)?(youtube\.com/(watch\?v=|embed/|v/|shorts/)|youtu\.be/)[\w\-]+"
-        if not re.match(pattern, v):
+        if not _YT_RE.match(v):
             raise ValueError("Invalid YouTube URL format")
         return v
 
@@ -2,8 +2,8 @@ import subprocess
 import os
 from pathlib import Path
 
-import librosa
 import numpy as np
+import soundfile as sf
 
 from app.core.config import settings
 from app.utils.logging import get_logger
@@ -58,13 +58,25 @@ def validate_audio_signal(audio_path: str) -> dict:
     """
     Validate audio signal health. Raises ValueError on bad input.
 
-    Returns metadata dict with sample_rate and duration to avoid
-    re-loading the file in downstream pipeline stages.
+    Returns metadata dict with sample_rate, duration and the decoded
+    mono array under "audio", so same-process callers don't pay for a
+    second full-file decode. Callers that persist the dict must drop the
+    array first.
     """
+    # Decode with soundfile directly — no resampling is requested, so
+    # librosa.load's resampler machinery (and its lazy resampy import) is
+    # pure overhead here. librosa remains the fallback for formats the
+    # installed libsndfile can't read.
     try:
-        y, sr = librosa.load(audio_path, sr=None, mono=True)
-    except Exception as e:
-        raise ValueError(f"Cannot load audio file: {e}")
+        data, sr = sf.read(audio_path, dtype="float32", always_2d=True)
+        y = data.mean(axis=1) if data.shape[1] > 1 else data[:, 0]
+    except Exception:
+        try:
+            import librosa
+
+            y, sr = librosa.load(audio_path, sr=None, mono=True)
+        except Exception as e:
+            raise ValueError(f"Cannot load audio file: {e}")
 
     # Sample rate check
     if sr < settings.MIN_SAMPLE_RATE:
@@ -73,7 +85,7 @@ def validate_audio_signal(audio_path: str) -> dict:
         )
 
     # Duration check
-    duration = librosa.get_duration(y=y, sr=sr)
+    duration = len(y) / sr
     if duration < settings.MIN_DURATION_SECONDS:
         raise ValueError(
             f"Audio duration {duration:.1f}s is below minimum {settings.MIN_DURATION_SECONDS}s"
@@ -84,7 +96,7 @@ def validate_audio_signal(audio_path: str) -> dict:
         )
 
     # Silence check (RMS energy)
-    rms = np.sqrt(np.mean(y ** 2))
+    rms = np.sqrt(np.mean(y * y, dtype=np.float64))
     if rms < settings.SILENCE_RMS_THRESHOLD:
         raise ValueError(
             f"Audio appears silent (RMS={rms:.6f}, threshold={settings.SILENCE_RMS_THRESHOLD})"
@@ -101,4 +113,5 @@ def validate_audio_signal(audio_path: str) -> dict:
     return {
         "sample_rate": sr,
         "duration_seconds": round(duration, 2),
+        "audio": y,
     }
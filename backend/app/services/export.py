@@ -7,9 +7,12 @@ PDF export supports two backends (configured via PDF_BACKEND env var):
   - "none"      — skip PDF generation entirely
 """
 
+import hashlib
+import os
+import shutil
 import subprocess
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
 
 from app.core.config import settings
 from app.utils.logging import get_logger
@@ -17,6 +20,50 @@ from app.utils.logging import get_logger
 logger = get_logger(__name__)
 
 
+def _pdf_cache_lookup(musicxml_path: str, output_path: str) -> tuple:
+    """Content-addressed PDF cache check.
+
+    Identical MusicXML renders an identical PDF, so re-exports and failed-PDF
+    retries can skip the music21 parse and LilyPond render entirely. Returns
+    (hit, cache_slot): on a hit the PDF has been copied to output_path; on a
+    miss cache_slot is the path to populate after rendering (None when the
+    cache is unusable).
+    """
+    try:
+        digest = hashlib.sha256(Path(musicxml_path).read_bytes()).hexdigest()
+        cache_dir = Path(settings.PDF_CACHE_DIR)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        cached = cache_dir / f"{digest}.pdf"
+        if cached.exists() and cached.stat().st_size > 0:
+            shutil.copyfile(cached, output_path)
+            logger.info(
+                "export_pdf_cache_hit", output=output_path, digest=digest[:16]
+            )
+            return True, None
+        return False, cached
+    except Exception as e:
+        logger.warning("export_pdf_cache_error", error=str(e))
+        return False, None
+
+
+def _pdf_cache_store(cache_slot: Optional[Path], output_path: str) -> None:
+    """Copy a freshly rendered PDF into its content-addressed slot.
+
+    Staged through a temp file in the cache directory and renamed into
+    place — _pdf_cache_lookup treats any non-empty file as a hit, so a
+    concurrent job must never observe a partially copied entry.
+    """
+    if cache_slot is None:
+        return
+    tmp = cache_slot.with_name(f"{cache_slot.name}.{os.getpid()}.tmp")
+    try:
+        shutil.copyfile(output_path, tmp)
+        os.replace(tmp, cache_slot)
+    except Exception as e:
+        logger.warning("export_pdf_cache_store_failed", error=str(e))
+        tmp.unlink(missing_ok=True)
+
+
 def export_musicxml(music21_stream: Any, output_path: str) -> str:
     """Export a music21 Stream to MusicXML format."""
     logger.info("export_musicxml_start", output=output_path)
@@ -25,11 +72,21 @@ def export_musicxml(music21_stream: Any, output_path: str) -> str:
     return output_path
 
 
-def export_pdf(musicxml_path: str, output_path: str) -> bool:
+def export_pdf(
+    musicxml_path: str, output_path: str, music21_stream: Any = None
+) -> bool:
     """
     Export MusicXML to PDF using the configured backend.
 
-    Returns True on success, False on failure (graceful degradation).
+    Pass the live music21 stream when the caller still holds it (the normal
+    pipeline case) so the LilyPond backend skips re-parsing the MusicXML it
+    just wrote. Returns True on success, False on failure (graceful
+    degradation).
+
+    Cross-job parallelism is handled above this layer: each render already
+    runs in its own LilyPond/MuseScore OS process, and concurrent jobs are
+    scheduled by Celery worker concurrency — an extra ProcessPoolExecutor
+    here would only duplicate that fan-out.
     """
     backend = settings.PDF_BACKEND.lower()
 
@@ -37,7 +94,9 @@ def export_pdf(musicxml_path: str, output_path: str) -> bool:
         logger.info("export_pdf_disabled", reason="PDF_BACKEND=none")
         return False
     elif backend == "lilypond":
-        return _export_pdf_lilypond(musicxml_path, output_path)
+        return _export_pdf_lilypond(
+            musicxml_path, output_path, music21_stream=music21_stream
+        )
     elif backend == "musescore":
         return _export_pdf_musescore(musicxml_path, output_path)
     else:
@@ -45,15 +104,22 @@ def export_pdf(musicxml_path: str, output_path: str) -> bool:
         return False
 
 
-def _export_pdf_lilypond(musicxml_path: str, output_path: str) -> bool:
+def _export_pdf_lilypond(
+    musicxml_path: str, output_path: str, music21_stream: Any = None
+) -> bool:
     """
     Export MusicXML to PDF via music21's LilyPond backend.
 
     music21 converts MusicXML → LilyPond format internally, then
-    LilyPond CLI renders the .ly file to PDF. Fully headless.
+    LilyPond CLI renders the .ly file to PDF. Fully headless. When the
+    in-memory stream is provided, the MusicXML round-trip parse is skipped.
     """
     logger.info("export_pdf_lilypond_start", input=musicxml_path, output=output_path)
 
+    cache_hit, cache_slot = _pdf_cache_lookup(musicxml_path, output_path)
+    if cache_hit:
+        return True
+
     try:
         from music21 import converter, environment
 
@@ -61,18 +127,29 @@ def _export_pdf_lilypond(musicxml_path: str, output_path: str) -> bool:
         env = environment.Environment()
         env["lilypondPath"] = settings.LILYPOND_BIN
 
-        # Load the MusicXML and export via LilyPond
-        score = converter.parse(musicxml_path)
+        # Use the caller's live stream when available — it's the same score
+        # export_musicxml just serialized, so re-parsing the XML would only
+        # burn a second full parse and a duplicate in-memory copy
+        if music21_stream is not None:
+            score = music21_stream
+        else:
+            score = converter.parse(musicxml_path)
 
         # music21's LilyPond export writes to a temp file; we need to
         # use the lily module directly for control over output path
         ly_path = Path(output_path).with_suffix(".ly")
         lpc = score.write("lilypond", fp=str(ly_path))
 
-        # Run LilyPond CLI to produce PDF
+        # Run LilyPond CLI to produce PDF. One process per document is a
+        # LilyPond constraint (it renders a single stdin/file document and
+        # exits; there is no server mode), so per-invocation work is kept
+        # minimal: ERROR-only logging and no point-and-click link
+        # generation. Repeat renders are absorbed by the content cache.
         cmd = [
             settings.LILYPOND_BIN,
             "--pdf",
+            "--loglevel=ERROR",
+            "-dno-point-and-click",
             "-o", str(Path(output_path).with_suffix("")),  # LilyPond appends .pdf
             str(ly_path),
         ]
@@ -104,6 +181,7 @@ def _export_pdf_lilypond(musicxml_path: str, output_path: str) -> bool:
             output=output_path,
             size=Path(output_path).stat().st_size,
         )
+        _pdf_cache_store(cache_slot, output_path)
         return True
 
     except FileNotFoundError:
@@ -1,13 +1,19 @@
 """
 Webhook service — fire-and-forget notification to user-configured URLs.
 
-Single retry on failure. Does not block the pipeline.
+Retries with capped exponential backoff and jitter. Does not block the pipeline.
 """
 
+import atexit
 import json
+import os
+import random
+import time
+from pathlib import Path
 from typing import Optional
 
 import httpx
+import orjson
 from sqlalchemy import select
 
 from app.core.config import settings
@@ -15,71 +21,181 @@ from app.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Shared client — keepalive connections let repeat deliveries to the same
+# host skip TCP + TLS setup instead of paying a full handshake per webhook
+_CLIENT = httpx.Client(
+    timeout=settings.WEBHOOK_TIMEOUT_SECONDS,
+    headers={"Content-Type": "application/json"},
+    limits=httpx.Limits(max_keepalive_connections=32),
+)
+atexit.register(_CLIENT.close)
+
+
+def _dlq_path() -> Path:
+    return Path(settings.ARTIFACTS_DIR) / "webhook_dlq.jsonl"
+
+
+def _dlq_append(job_id: str, url: str, payload: dict) -> None:
+    """Persist an undeliverable payload for later replay.
+
+    Losing the event would force a full pipeline re-run just to regenerate
+    the notification; a JSONL dead-letter file keeps it replayable by the
+    periodic sweeper instead. Best-effort — DLQ failures are only logged.
+    """
+    try:
+        path = _dlq_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        record = {
+            "job_id": job_id,
+            "url": url,
+            "payload": payload,
+            "failed_at": time.time(),
+        }
+        with open(path, "a") as f:
+            f.write(json.dumps(record) + "\n")
+        logger.info("webhook_dead_lettered", job_id=job_id, url=url)
+    except Exception as e:
+        logger.error("webhook_dlq_write_failed", job_id=job_id, error=str(e))
+
+
+def replay_dlq() -> int:
+    """Replay dead-lettered webhook deliveries. Returns count delivered.
+
+    The current DLQ file is claimed via rename so concurrent sweeps never
+    double-send; entries that fail again are re-dead-lettered by
+    _send_webhook itself.
+    """
+    path = _dlq_path()
+    if not path.exists():
+        return 0
+    claim = path.with_suffix(".replaying")
+    try:
+        os.replace(path, claim)
+    except OSError:
+        return 0
+
+    delivered = 0
+    try:
+        for line in claim.read_text().splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if _send_webhook(
+                record["url"], record["payload"], job_id=record.get("job_id", "")
+            ):
+                delivered += 1
+    finally:
+        claim.unlink(missing_ok=True)
+
+    logger.info("webhook_dlq_replayed", delivered=delivered)
+    return delivered
+
 
 def fire_webhook(job_id: str, webhook_url: str) -> None:
     """POST job result (or error) to the configured webhook URL."""
+    payload = _build_payload(job_id)
+    if payload is None:
+        return
+    _send_webhook(webhook_url, payload, job_id=job_id)
+
+
+def _build_payload(job_id: str) -> Optional[dict]:
+    """Load the job and serialize the notification payload (sync DB)."""
     from app.core.database_sync import get_sync_db
     from app.models.job import Job
 
     db = get_sync_db()
     try:
-        job = db.execute(select(Job).where(Job.id == job_id)).scalar_one_or_none()
-        if job is None:
+        # Column projection — a plain row tuple skips ORM hydration and
+        # identity-map bookkeeping for a read-once payload
+        row = db.execute(
+            select(
+                Job.id,
+                Job.status,
+                Job.title,
+                Job.detected_bpm,
+                Job.duration_seconds,
+                Job.confidence_score,
+                Job.hit_summary,
+                Job.warnings,
+                Job.compute_time_ms,
+                Job.model_version,
+                Job.error_message,
+                Job.result_musicxml_path,
+                Job.result_pdf_path,
+            ).where(Job.id == job_id)
+        ).first()
+        if row is None:
             logger.warning("webhook_job_not_found", job_id=job_id)
-            return
+            return None
 
         payload = {
-            "job_id": str(job.id),
-            "status": job.status.value if hasattr(job.status, "value") else str(job.status),
-            "title": job.title,
-            "detected_bpm": job.detected_bpm,
-            "duration_seconds": job.duration_seconds,
-            "confidence_score": job.confidence_score,
-            "hit_summary": job.hit_summary,
-            "warnings": job.warnings or [],
-            "compute_time_ms": job.compute_time_ms,
-            "model_version": job.model_version,
-            "error_message": job.error_message,
+            "job_id": str(row.id),
+            "status": row.status.value if hasattr(row.status, "value") else str(row.status),
+            "title": row.title,
+            "detected_bpm": row.detected_bpm,
+            "duration_seconds": row.duration_seconds,
+            "confidence_score": row.confidence_score,
+            "hit_summary": row.hit_summary,
+            "warnings": row.warnings or [],
+            "compute_time_ms": row.compute_time_ms,
+            "model_version": row.model_version,
+            "error_message": row.error_message,
         }
 
-        if job.result_musicxml_path:
+        if row.result_musicxml_path:
             payload["download_urls"] = {
-                "musicxml": f"/api/v1/jobs/{job.id}/download/musicxml",
+                "musicxml": f"/api/v1/jobs/{row.id}/download/musicxml",
             }
-            if job.result_pdf_path:
-                payload["download_urls"]["pdf"] = f"/api/v1/jobs/{job.id}/download/pdf"
+            if row.result_pdf_path:
+                payload["download_urls"]["pdf"] = f"/api/v1/jobs/{row.id}/download/pdf"
 
+        return payload
     finally:
         db.close()
 
-    _send_webhook(webhook_url, payload, job_id=job_id)
-
 
 def _send_webhook(
     url: str,
     payload: dict,
     job_id: str = "",
-    max_retries: int = 1,
-) -> None:
-    """Send webhook with a single retry on failure."""
-    timeout = settings.WEBHOOK_TIMEOUT_SECONDS
+    max_retries: Optional[int] = None,
+) -> bool:
+    """Send webhook with capped exponential backoff and full jitter.
+
+    Retries network errors, 5xx and 429; other 4xx responses are treated
+    as permanent and abandoned immediately. Full jitter keeps many jobs
+    completing at once from retrying in lockstep against the same endpoint.
+    """
+    if max_retries is None:
+        max_retries = settings.WEBHOOK_MAX_RETRIES
+
+    # Encode once, outside the retry loop — json= would re-serialize with
+    # stdlib json on every attempt
+    blob = orjson.dumps(payload, default=str)
 
     for attempt in range(1 + max_retries):
+        retryable = True
         try:
-            response = httpx.post(
-                url,
-                json=payload,
-                timeout=timeout,
-                headers={"Content-Type": "application/json"},
-            )
-            logger.info(
-                "webhook_sent",
+            response = _CLIENT.post(url, content=blob)
+            if response.status_code < 400:
+                logger.info(
+                    "webhook_sent",
+                    job_id=job_id,
+                    url=url,
+                    status_code=response.status_code,
+                    attempt=attempt + 1,
+                )
+                return True
+            retryable = response.status_code >= 500 or response.status_code == 429
+            logger.warning(
+                "webhook_failed",
                 job_id=job_id,
                 url=url,
-                status_code=response.status_code,
                 attempt=attempt + 1,
+                status_code=response.status_code,
             )
-            return
         except Exception as e:
             logger.warning(
                 "webhook_failed",
@@ -89,9 +205,24 @@ def _send_webhook(
                 error=str(e),
             )
 
+        if not retryable:
+            logger.error("webhook_rejected", job_id=job_id, url=url)
+            return False
+        if attempt < max_retries:
+            delay = random.uniform(
+                0,
+                min(
+                    settings.WEBHOOK_MAX_DELAY_SECONDS,
+                    settings.WEBHOOK_BASE_DELAY_SECONDS * 2**attempt,
+                ),
+            )
+            time.sleep(delay)
+
     logger.error(
         "webhook_exhausted_retries",
         job_id=job_id,
         url=url,
         max_retries=max_retries,
     )
+    _dlq_append(job_id, url, payload)
+    return False
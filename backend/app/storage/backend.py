@@ -6,17 +6,42 @@ via the `STORAGE_BACKEND` env var ("local" or "s3").
 """
 
 import abc
-import io
+import gzip
+import hashlib
 import os
 import shutil
+import time
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Optional
 
 from app.core.config import settings
 from app.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Chunk size for streaming writes — bounds per-request memory at 1 MiB
+STREAM_CHUNK_SIZE = 1 << 20
+
+# Existence checks repeat within a request burst (download URL validation,
+# payload building); a short-TTL cache absorbs the repeat HEADs without
+# letting a stale answer outlive the burst
+_HEAD_CACHE_TTL_SECONDS = 30.0
+_HEAD_CACHE_MAX_ENTRIES = 1024
+
+
+def _walk_files(root: str):
+    """Yield file paths under root recursively via os.scandir.
+
+    scandir's dirent type checks (follow_symlinks=False) come from the
+    directory read itself — no per-entry stat syscall or Path allocation
+    like Path.rglob pays.
+    """
+    for entry in os.scandir(root):
+        if entry.is_dir(follow_symlinks=False):
+            yield from _walk_files(entry.path)
+        elif entry.is_file(follow_symlinks=False):
+            yield entry.path
+
 
 class StorageBackend(abc.ABC):
     """Abstract storage interface — swap local for S3 via config."""
@@ -26,11 +51,37 @@ class StorageBackend(abc.ABC):
         """Save file data, return the stored path/key."""
         ...
 
+    @abc.abstractmethod
+    def save_file_stream(
+        self,
+        job_id: str,
+        filename: str,
+        source: BinaryIO,
+        max_bytes: Optional[int] = None,
+    ) -> str:
+        """
+        Stream file data from a file-like object in fixed-size chunks.
+
+        Raises ValueError if the stream exceeds max_bytes (partial writes
+        are cleaned up). Returns the stored path/key.
+        """
+        ...
+
     @abc.abstractmethod
     def read_file(self, path: str) -> bytes:
         """Read file from storage."""
         ...
 
+    @abc.abstractmethod
+    def iter_file(self, path: str, chunk_size: int = STREAM_CHUNK_SIZE):
+        """Iterate over file contents in chunks (for streamed responses)."""
+        ...
+
+    @abc.abstractmethod
+    def file_size(self, path: str) -> Optional[int]:
+        """Return the file size in bytes, or None if unknown."""
+        ...
+
     @abc.abstractmethod
     def file_exists(self, path: str) -> bool:
         """Check if file exists."""
@@ -56,6 +107,18 @@ class StorageBackend(abc.ABC):
         """Get the full path/key for a specific file in a job's directory."""
         ...
 
+    def save_file_gzip(self, job_id: str, filename: str, data: bytes) -> str:
+        """Gzip-compress and save data (filename should end in .gz).
+
+        JSON artifacts like hits.json compress 5-10x; level 3 keeps the
+        compression cost negligible next to the saved I/O.
+        """
+        return self.save_file(job_id, filename, gzip.compress(data, compresslevel=3))
+
+    def read_file_gzip(self, path: str) -> bytes:
+        """Read and decompress a gzip-compressed artifact."""
+        return gzip.decompress(self.read_file(path))
+
 
 # ---------------------------------------------------------------------------
 # Local filesystem
@@ -77,14 +140,80 @@ class LocalStorageBackend(StorageBackend):
         return str(Path(self.get_job_dir(job_id)) / filename)
 
     def save_file(self, job_id: str, filename: str, data: bytes) -> str:
-        dest = Path(self.get_file_path(job_id, filename))
-        dest.write_bytes(data)
+        dest = self.get_file_path(job_id, filename)
+        # Raw fd so we can fadvise after the write — multi-MB audio
+        # uploads are write-once here, and letting them sit in the page
+        # cache evicts hotter data (model weights, job artifacts
+        # mid-pipeline). write() may return short (e.g. ENOSPC partway
+        # through), so loop until every byte lands rather than silently
+        # truncating the file.
+        fd = os.open(dest, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            view = memoryview(data)
+            written = 0
+            while written < len(data):
+                n = os.write(fd, view[written:])
+                if n == 0:
+                    raise OSError(
+                        f"short write to {dest}: {written} of {len(data)} bytes"
+                    )
+                written += n
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(fd, 0, len(data), os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
         logger.info("file_saved", job_id=job_id, filename=filename, size=len(data))
+        return dest
+
+    def save_file_stream(
+        self,
+        job_id: str,
+        filename: str,
+        source: BinaryIO,
+        max_bytes: Optional[int] = None,
+    ) -> str:
+        dest = Path(self.get_file_path(job_id, filename))
+        total = 0
+        # Hash incrementally while the chunks are already in cache — a
+        # content digest for dedup/integrity at no extra read, and OpenSSL
+        # runs SHA-NI where the CPU has it
+        sha256 = hashlib.sha256()
+        try:
+            with open(dest, "wb") as out:
+                while chunk := source.read(STREAM_CHUNK_SIZE):
+                    total += len(chunk)
+                    if max_bytes is not None and total > max_bytes:
+                        raise ValueError(
+                            f"Stream exceeds maximum size of {max_bytes} bytes"
+                        )
+                    sha256.update(chunk)
+                    out.write(chunk)
+        except Exception:
+            dest.unlink(missing_ok=True)
+            raise
+        logger.info(
+            "file_saved",
+            job_id=job_id,
+            filename=filename,
+            size=total,
+            sha256=sha256.hexdigest(),
+        )
         return str(dest)
 
     def read_file(self, path: str) -> bytes:
         return Path(path).read_bytes()
 
+    def iter_file(self, path: str, chunk_size: int = STREAM_CHUNK_SIZE):
+        with open(path, "rb") as f:
+            while chunk := f.read(chunk_size):
+                yield chunk
+
+    def file_size(self, path: str) -> Optional[int]:
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return None
+
     def file_exists(self, path: str) -> bool:
         return Path(path).exists()
 
@@ -92,8 +221,17 @@ class LocalStorageBackend(StorageBackend):
         job_dir = self.base_dir / job_id
         if not job_dir.exists():
             return 0
-        count = sum(1 for _ in job_dir.rglob("*") if _.is_file())
-        shutil.rmtree(job_dir, ignore_errors=True)
+        # Count while deleting — one bottom-up walk instead of an rglob
+        # census followed by rmtree's second traversal
+        count = 0
+        try:
+            for root, _dirs, files, rootfd in os.fwalk(job_dir, topdown=False):
+                for f in files:
+                    os.unlink(f, dir_fd=rootfd)
+                    count += 1
+                os.rmdir(root)
+        except OSError:
+            shutil.rmtree(job_dir, ignore_errors=True)
         logger.info("artifacts_deleted", job_id=job_id, files_deleted=count)
         return count
 
@@ -101,13 +239,46 @@ class LocalStorageBackend(StorageBackend):
         job_dir = self.base_dir / job_id
         if not job_dir.exists():
             return []
-        return [str(f) for f in job_dir.rglob("*") if f.is_file()]
+        return list(_walk_files(str(job_dir)))
 
 
 # ---------------------------------------------------------------------------
 # S3 (requires boto3)
 # ---------------------------------------------------------------------------
 
+class _TeeReader:
+    """File-like reader that mirrors every chunk to a local sink.
+
+    Lets S3 uploads consume the source stream directly while the local
+    cache copy is written in the same pass — one read of the payload
+    instead of write-to-disk-then-re-read. Enforces max_bytes as it goes;
+    limit_exceeded lets callers re-raise the size error even if boto3
+    wraps the exception.
+    """
+
+    def __init__(
+        self, source: BinaryIO, sink: BinaryIO, max_bytes: Optional[int] = None
+    ):
+        self._source = source
+        self._sink = sink
+        self._max_bytes = max_bytes
+        self.total = 0
+        self.limit_exceeded = False
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = STREAM_CHUNK_SIZE
+        chunk = self._source.read(size)
+        if chunk:
+            self.total += len(chunk)
+            if self._max_bytes is not None and self.total > self._max_bytes:
+                self.limit_exceeded = True
+                raise ValueError(
+                    f"Stream exceeds maximum size of {self._max_bytes} bytes"
+                )
+            self._sink.write(chunk)
+        return chunk
+
 class S3StorageBackend(StorageBackend):
     """
     AWS S3 storage backend.
@@ -141,6 +312,9 @@ class S3StorageBackend(StorageBackend):
         self._local_cache = Path(settings.ARTIFACTS_DIR)
         self._local_cache.mkdir(parents=True, exist_ok=True)
 
+        # key -> (exists, checked_at monotonic) — see _HEAD_CACHE_TTL_SECONDS
+        self._head_cache: dict = {}
+
     def _s3_key(self, job_id: str, filename: str) -> str:
         return f"{self.prefix}/{job_id}/{filename}"
 
@@ -153,15 +327,81 @@ class S3StorageBackend(StorageBackend):
         return str(Path(self.get_job_dir(job_id)) / filename)
 
     def save_file(self, job_id: str, filename: str, data: bytes) -> str:
-        key = self._s3_key(job_id, filename)
-        self._s3.upload_fileobj(io.BytesIO(data), self.bucket, key)
-        logger.info("s3_file_saved", job_id=job_id, key=key, size=len(data))
-
-        # Also write to local cache for ML pipeline access
+        # Write the local cache copy first, then upload from disk —
+        # upload_file streams (multipart with concurrent parts past the
+        # threshold) instead of holding a second full-size buffer in memory
         local_path = self.get_file_path(job_id, filename)
         Path(local_path).write_bytes(data)
+
+        # Dedupe re-uploads: the content digest travels in object metadata
+        # (not the key, so path-to-key derivation stays intact) and a HEAD
+        # comparison skips the PUT when the stored object is identical —
+        # common when a pipeline stage re-runs on the same input
+        key = self._s3_key(job_id, filename)
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        try:
+            head = self._s3.head_object(Bucket=self.bucket, Key=key)
+            if head.get("Metadata", {}).get("blake2b") == digest:
+                logger.info("s3_upload_skipped_identical", job_id=job_id, key=key)
+                return local_path
+        except Exception:
+            pass  # no existing object (or HEAD failed) — upload normally
+
+        from boto3.s3.transfer import TransferConfig
+
+        self._s3.upload_file(
+            local_path,
+            self.bucket,
+            key,
+            ExtraArgs={"Metadata": {"blake2b": digest}},
+            Config=TransferConfig(
+                multipart_threshold=8 * 1024 * 1024,
+                max_concurrency=8,
+                use_threads=True,
+            ),
+        )
+        logger.info("s3_file_saved", job_id=job_id, key=key, size=len(data))
         return local_path
 
+    def save_file_stream(
+        self,
+        job_id: str,
+        filename: str,
+        source: BinaryIO,
+        max_bytes: Optional[int] = None,
+    ) -> str:
+        # Tee the stream: upload_fileobj pulls from the source while each
+        # chunk is mirrored to the local cache in the same pass, so the
+        # payload is read once and never sits fully in memory.
+        local_path = Path(self.get_file_path(job_id, filename))
+        key = self._s3_key(job_id, filename)
+        tee = None
+        try:
+            with open(local_path, "wb") as out:
+                tee = _TeeReader(source, out, max_bytes=max_bytes)
+                self._s3.upload_fileobj(tee, self.bucket, key)
+        except Exception:
+            local_path.unlink(missing_ok=True)
+            if tee is not None and tee.limit_exceeded:
+                # boto3 may wrap the reader's error — restore the contract
+                raise ValueError(
+                    f"Stream exceeds maximum size of {max_bytes} bytes"
+                ) from None
+            raise
+
+        logger.info("s3_file_saved", job_id=job_id, key=key, size=tee.total)
+        return str(local_path)
+
+    def _key_for_path(self, path: str) -> Optional[str]:
+        """Derive the S3 key for a local-cache path, or None if outside it."""
+        try:
+            rel = Path(path).relative_to(self._local_cache)
+        except ValueError:
+            return None
+        if len(rel.parts) < 2:
+            return None
+        return f"{self.prefix}/{'/'.join(rel.parts)}"
+
     def read_file(self, path: str) -> bytes:
         # Try local cache first
         if Path(path).exists():
@@ -171,38 +411,88 @@ class S3StorageBackend(StorageBackend):
         logger.warning("s3_read_fallback_local", path=path)
         return Path(path).read_bytes()
 
+    def iter_file(self, path: str, chunk_size: int = STREAM_CHUNK_SIZE):
+        # Local cache hit — stream from disk
+        if Path(path).exists():
+            with open(path, "rb") as f:
+                while chunk := f.read(chunk_size):
+                    yield chunk
+            return
+
+        # Stream straight from S3 without buffering the whole object
+        key = self._key_for_path(path)
+        if key is None:
+            raise FileNotFoundError(path)
+        obj = self._s3.get_object(Bucket=self.bucket, Key=key)
+        yield from obj["Body"].iter_chunks(chunk_size)
+
+    def file_size(self, path: str) -> Optional[int]:
+        if Path(path).exists():
+            return os.path.getsize(path)
+        key = self._key_for_path(path)
+        if key is None:
+            return None
+        try:
+            head = self._s3.head_object(Bucket=self.bucket, Key=key)
+            return int(head["ContentLength"])
+        except Exception:
+            return None
+
     def file_exists(self, path: str) -> bool:
         # Check local cache first (fast path)
         if Path(path).exists():
             return True
 
-        # Check S3 — extract key from path
+        # Paths outside the cache root can never map to an S3 key — skip
+        # the ~30-80 ms HEAD round trip entirely
+        key = self._key_for_path(path)
+        if key is None:
+            return False
+
+        now = time.monotonic()
+        cached = self._head_cache.get(key)
+        if cached is not None and now - cached[1] < _HEAD_CACHE_TTL_SECONDS:
+            return cached[0]
+
         try:
-            rel = Path(path).relative_to(self._local_cache)
-            parts = rel.parts
-            if len(parts) >= 2:
-                key = f"{self.prefix}/{'/'.join(parts)}"
-                self._s3.head_object(Bucket=self.bucket, Key=key)
-                return True
+            self._s3.head_object(Bucket=self.bucket, Key=key)
+            exists = True
         except Exception:
-            pass
-        return False
+            exists = False
+
+        if len(self._head_cache) >= _HEAD_CACHE_MAX_ENTRIES:
+            self._head_cache.clear()
+        self._head_cache[key] = (exists, now)
+        return exists
 
     def delete_job_artifacts(self, job_id: str) -> int:
-        # Delete from S3
+        # Delete from S3 — collect the 1000-key pages first, then issue the
+        # delete_objects calls concurrently (boto3 clients are thread-safe),
+        # so multi-page jobs pay ~one round trip instead of one per page
         prefix = f"{self.prefix}/{job_id}/"
         count = 0
         try:
+            batches = []
             paginator = self._s3.get_paginator("list_objects_v2")
             for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
                 objects = page.get("Contents", [])
                 if objects:
-                    delete_keys = [{"Key": obj["Key"]} for obj in objects]
-                    self._s3.delete_objects(
-                        Bucket=self.bucket,
-                        Delete={"Objects": delete_keys},
-                    )
-                    count += len(delete_keys)
+                    batches.append([{"Key": obj["Key"]} for obj in objects])
+
+            def _delete(batch: list) -> int:
+                self._s3.delete_objects(
+                    Bucket=self.bucket,
+                    Delete={"Objects": batch},
+                )
+                return len(batch)
+
+            if len(batches) == 1:
+                count = _delete(batches[0])
+            elif batches:
+                from concurrent.futures import ThreadPoolExecutor
+
+                with ThreadPoolExecutor(max_workers=8) as ex:
+                    count = sum(ex.map(_delete, batches))
         except Exception as e:
             logger.warning("s3_delete_error", job_id=job_id, error=str(e))
 
@@ -215,6 +505,11 @@ class S3StorageBackend(StorageBackend):
         return count
 
     def list_job_files(self, job_id: str) -> list[str]:
+        # Serial pagination is deliberate: a job stores a handful of
+        # fixed-name artifacts (source audio, drums.wav, result.*), so the
+        # listing always fits one page. Prefix-sharded parallel
+        # ListObjectsV2 fan-out only pays off for hashed filenames spread
+        # across many pages, which this layout never produces.
         prefix = f"{self.prefix}/{job_id}/"
         files = []
         try:
@@ -1,41 +1,72 @@
+import functools
 import logging
 import sys
 
+import orjson
 import structlog
 
 from app.core.config import settings
 
 
+def _json_dumps(obj, **kwargs) -> str:
+    """orjson serializer for JSONRenderer — ~5x faster than stdlib json.
+
+    default=str keeps odd values (UUIDs, paths) loggable instead of
+    raising mid-log-call.
+    """
+    return orjson.dumps(obj, default=str).decode()
+
+# Stack/exception rendering pulled out of the hot path: the vast majority
+# of records are info-level with neither exc_info nor stack_info, so the
+# two processors only run when there is actually something to render
+_STACK_INFO_RENDERER = structlog.processors.StackInfoRenderer()
+
+
+def _render_error_details(logger, method_name, event_dict):
+    if (
+        event_dict.get("level") in ("error", "critical", "exception")
+        or "exc_info" in event_dict
+        or "stack_info" in event_dict
+    ):
+        event_dict = _STACK_INFO_RENDERER(logger, method_name, event_dict)
+        event_dict = structlog.processors.format_exc_info(
+            logger, method_name, event_dict
+        )
+    return event_dict
+
+
 def setup_logging() -> None:
     """Configure structured JSON logging via structlog."""
+    log_level = getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO)
+
     structlog.configure(
         processors=[
             structlog.contextvars.merge_contextvars,
-            structlog.stdlib.filter_by_level,
             structlog.stdlib.add_logger_name,
             structlog.stdlib.add_log_level,
             structlog.stdlib.PositionalArgumentsFormatter(),
             structlog.processors.TimeStamper(fmt="iso"),
-            structlog.processors.StackInfoRenderer(),
-            structlog.processors.format_exc_info,
+            _render_error_details,
             structlog.processors.UnicodeDecoder(),
-            structlog.processors.JSONRenderer(),
+            structlog.processors.JSONRenderer(serializer=_json_dumps),
         ],
-        wrapper_class=structlog.stdlib.BoundLogger,
+        # Filter at the bound-logger method itself — a suppressed call
+        # returns before the processor chain (context merge, timestamping,
+        # JSON encoding) runs at all, unlike filter_by_level which paid for
+        # the chain up to that point
+        wrapper_class=structlog.make_filtering_bound_logger(log_level),
         context_class=dict,
         logger_factory=structlog.stdlib.LoggerFactory(),
         cache_logger_on_first_use=True,
     )
 
-    log_level = getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO)
-
     root_logger = logging.getLogger()
     root_logger.setLevel(log_level)
 
     handler = logging.StreamHandler(sys.stdout)
     handler.setLevel(log_level)
     formatter = structlog.stdlib.ProcessorFormatter(
-        processor=structlog.processors.JSONRenderer(),
+        processor=structlog.processors.JSONRenderer(serializer=_json_dumps),
     )
     handler.setFormatter(formatter)
 
@@ -43,6 +74,7 @@ def setup_logging() -> None:
     root_logger.addHandler(handler)
 
 
-def get_logger(name: str | None = None) -> structlog.stdlib.BoundLogger:
-    """Get a structured logger instance."""
+@functools.lru_cache(maxsize=None)
+def get_logger(name: str | None = None) -> structlog.typing.FilteringBoundLogger:
+    """Get a structured logger instance (memoized per name)."""
     return structlog.get_logger(name)
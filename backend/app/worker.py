@@ -1,21 +1,28 @@
 import gc
+import json
+import os
 import time
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+import orjson
+import structlog
 from celery import Celery, chain
 from celery.signals import worker_init
 from sqlalchemy import select
 
 from app.core.config import settings
 from app.core.telemetry import (
-    INFERENCE_LATENCY,
+    FAST_STAGE_LATENCY,
+    SLOW_STAGE_LATENCY,
     JOBS_TOTAL,
     JOBS_FAILED_TOTAL,
     ACTIVE_JOBS_GAUGE,
     AUDIO_DURATION_PROCESSED,
 )
 
+logger = structlog.get_logger("worker")
+
 celery_app = Celery(
     "drumscribe",
     broker=settings.CELERY_BROKER_URL,
@@ -26,9 +33,16 @@ celery_app = Celery(
 celery_app.conf.task_routes = {
     "app.worker.separate_drums": {"queue": "heavy-compute"},
     "app.worker.predict_hits": {"queue": "heavy-compute"},
+    "app.worker.ingest_and_separate": {"queue": "heavy-compute"},
+    "app.worker.predict_and_export": {"queue": "heavy-compute"},
     "app.worker.ingest_audio": {"queue": "default"},
     "app.worker.transcribe_and_export": {"queue": "default"},
+    "app.worker.fire_webhook_task": {"queue": "default"},
+    "app.worker.fail_pipeline": {"queue": "default"},
+    "app.worker.render_pdf": {"queue": "default"},
+    "app.worker.cleanup_job_artifacts": {"queue": "default"},
     "app.worker.cleanup_old_artifacts": {"queue": "default"},
+    "app.worker.replay_webhook_dlq": {"queue": "default"},
 }
 
 celery_app.conf.task_default_queue = "default"
@@ -36,12 +50,19 @@ celery_app.conf.task_default_queue = "default"
 # Task reliability settings
 celery_app.conf.task_acks_late = True
 celery_app.conf.task_reject_on_worker_lost = True
-celery_app.conf.worker_prefetch_multiplier = 1
-
-# Serialization
-celery_app.conf.task_serializer = "json"
-celery_app.conf.result_serializer = "json"
-celery_app.conf.accept_content = ["json"]
+# Prefetch is tuned per worker invocation, not globally: the heavy-compute
+# worker runs with --prefetch-multiplier=1 so a multi-minute separation
+# never holds a second job reserved-but-idle, while the default worker
+# prefetches 2 to hide broker round-trip latency on its short I/O tasks
+# (see docker-compose.yml worker commands)
+
+# Serialization — msgpack encodes the small task/result dicts ~2-3x
+# smaller and parses faster than JSON, cutting broker bandwidth per chain
+# hop. json stays in accept_content so messages queued by an older
+# deploy still drain during rollout.
+celery_app.conf.task_serializer = "msgpack"
+celery_app.conf.result_serializer = "msgpack"
+celery_app.conf.accept_content = ["msgpack", "json"]
 
 # Periodic tasks (Celery Beat)
 celery_app.conf.beat_schedule = {
@@ -49,6 +70,10 @@ celery_app.conf.beat_schedule = {
         "task": "app.worker.cleanup_old_artifacts",
         "schedule": 3600.0,  # Every hour
     },
+    "replay-webhook-dlq": {
+        "task": "app.worker.replay_webhook_dlq",
+        "schedule": 900.0,  # Every 15 minutes
+    },
 }
 
 
@@ -56,14 +81,83 @@ celery_app.conf.beat_schedule = {
 # Helpers
 # ---------------------------------------------------------------------------
 
+# Audio extensions accepted as pipeline source input; a tuple so directory
+# scans can use str.endswith() without constructing a Path per entry
+AUDIO_EXTS = (".wav", ".mp3", ".flac", ".ogg")
+
+_events_redis = None
+_storage = None
+
+
+def _get_storage():
+    """Memoized storage backend — warmed once in worker_init."""
+    global _storage
+    if _storage is None:
+        from app.storage.backend import get_storage
+
+        _storage = get_storage()
+    return _storage
+
+
+def _publish_job_event(job_id: str, fields: dict) -> None:
+    """Publish a status/progress event on the job's Redis pub/sub channel.
+
+    WebSocket subscribers receive these instead of polling the DB.
+    Best-effort — a failed publish never fails the pipeline.
+    """
+    global _events_redis
+    try:
+        if _events_redis is None:
+            import redis
+
+            _events_redis = redis.from_url(settings.REDIS_URL)
+        _events_redis.publish(f"job:{job_id}", json.dumps({"job_id": job_id, **fields}))
+    except Exception:
+        _events_redis = None
+
+
+def _publish_progress(job_id: str, progress: int, status: str = None) -> None:
+    """Record ephemeral pipeline progress in Redis instead of Postgres.
+
+    Progress only drives the progress bar; persisting every tick was a
+    synchronous UPDATE+COMMIT on the heavy-compute worker. The hash is
+    merged into GET /jobs/{id} responses and expires on its own; only
+    terminal state and durable fields still go through _update_job.
+    Best-effort — a failed publish never fails the pipeline.
+    """
+    global _events_redis
+    fields = {"progress": progress}
+    if status is not None:
+        fields["status"] = status
+    try:
+        if _events_redis is None:
+            import redis
+
+            _events_redis = redis.from_url(settings.REDIS_URL)
+        key = f"job:{job_id}:progress"
+        pipe = _events_redis.pipeline(transaction=False)
+        pipe.hset(key, mapping=fields)
+        pipe.expire(key, 3600)
+        pipe.publish(f"job:{job_id}", json.dumps({"job_id": job_id, **fields}))
+        pipe.execute()
+    except Exception:
+        _events_redis = None
+
+
 def _update_job(job_id: str, **kwargs) -> None:
-    """Update job fields in the database (sync, for Celery workers)."""
-    from app.core.database_sync import get_sync_db
+    """Update job fields in the database (sync, for Celery workers).
+
+    Uses the worker's thread-local session — each task makes several
+    one-row calls, and a fresh open/commit/close cycle per call was
+    pure connection churn. session.get() hits the identity map instead
+    of re-parsing a SELECT.
+    """
+    from app.core.database_sync import SyncScopedSession
     from app.models.job import Job
 
-    db = get_sync_db()
+    db = SyncScopedSession()
     try:
-        job = db.execute(select(Job).where(Job.id == job_id)).scalar_one_or_none()
+        job = db.get(Job, job_id)
         if job is None:
             return
         for key, value in kwargs.items():
@@ -72,23 +166,49 @@ def _update_job(job_id: str, **kwargs) -> None:
     except Exception:
         db.rollback()
         raise
-    finally:
-        db.close()
+
+    if "status" in kwargs or "progress" in kwargs:
+        event = {k: v for k, v in kwargs.items() if k in ("status", "progress", "error_message")}
+        _publish_job_event(job_id, event)
 
 
 def _get_job_field(job_id: str, field: str):
-    """Read a single field from a job record."""
-    from app.core.database_sync import get_sync_db
+    """Read a single field from a job record (thread-local session)."""
+    from app.core.database_sync import SyncScopedSession
     from app.models.job import Job
 
-    db = get_sync_db()
+    db = SyncScopedSession()
     try:
-        job = db.execute(select(Job).where(Job.id == job_id)).scalar_one_or_none()
+        job = db.get(Job, job_id)
         if job is None:
             return None
         return getattr(job, field, None)
     finally:
-        db.close()
+        # End the read transaction: the connection goes back to the pool
+        # and the expired identity map re-reads fresh rows next call
+        db.rollback()
+
+
+def _get_job_fields(job_id: str, *fields: str) -> dict:
+    """Read several job columns in one round trip.
+
+    Tasks that need a handful of values (bpm, title, webhook_url, ...)
+    should fetch them together instead of one _get_job_field query each.
+    Returns an empty dict when the job is missing.
+    """
+    from app.core.database_sync import SyncScopedSession
+    from app.models.job import Job
+
+    db = SyncScopedSession()
+    try:
+        row = db.execute(
+            select(*(getattr(Job, f) for f in fields)).where(Job.id == job_id)
+        ).first()
+        if row is None:
+            return {}
+        return dict(zip(fields, row))
+    finally:
+        db.rollback()
 
 
 def _fail_job(job_id: str, error_message: str, stage: str) -> None:
@@ -98,20 +218,46 @@ def _fail_job(job_id: str, error_message: str, stage: str) -> None:
         status="failed",
         error_message=error_message,
     )
+    _release_user_slot(job_id)
     JOBS_FAILED_TOTAL.labels(failure_stage=stage).inc()
     JOBS_TOTAL.labels(status="failed").inc()
     ACTIVE_JOBS_GAUGE.dec()
 
 
+def _rss_mb() -> float:
+    """Current resident set size in MiB (workers run on Linux)."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+
+def _release_user_slot(job_id: str) -> None:
+    """Release the user's Redis concurrency slot on terminal transitions."""
+    from app.core.security import release_concurrency_slot
+
+    release_concurrency_slot(_get_job_field(job_id, "user_identifier"))
+
+
 def dispatch_pipeline(job_id: str) -> None:
-    """Dispatch the full transcription pipeline as a Celery chain."""
+    """Dispatch the full transcription pipeline as a Celery chain.
+
+    Two fused tasks instead of four: each chain hop costs a broker
+    round trip, an ack and a job-row re-fetch, which dominates on short
+    clips. Ingest rides along with separation and export with
+    prediction; the stage implementations stay separate tasks so their
+    idempotency checks and retries are unchanged.
+    """
     pipeline = chain(
-        ingest_audio.s(job_id),
-        separate_drums.s(),
-        predict_hits.s(),
-        transcribe_and_export.s(),
+        ingest_and_separate.s(job_id),
+        predict_and_export.s(),
     )
-    result = pipeline.apply_async()
+    # The errback covers failures the stage handlers can't see — e.g. a
+    # worker killed by the OOM reaper or a message that can't deserialize —
+    # so a job never sits in a non-terminal status forever
+    result = pipeline.apply_async(link_error=fail_pipeline.s(job_id))
 
     # Store the root task ID for cancellation support
     _update_job(job_id, celery_task_id=result.id)
@@ -124,10 +270,10 @@ def dispatch_pipeline(job_id: str) -> None:
 @worker_init.connect
 def on_worker_init(**kwargs):
     """Called once when a Celery worker process starts — preload ML models."""
-    import structlog
-    logger = structlog.get_logger("worker_init")
     logger.info("worker_starting", queues=kwargs.get("sender", ""))
 
+    _get_storage()
+
     from app.ml.registry import preload_models
     preload_models()
 
@@ -139,47 +285,65 @@ def on_worker_init(**kwargs):
 @celery_app.task(name="app.worker.ingest_audio")
 def ingest_audio(job_id: str) -> str:
     """Audio ingestion — validate uploaded file or download from YouTube."""
-    import structlog
-    logger = structlog.get_logger("task.ingest_audio")
+    log = logger.bind(task="ingest_audio", job_id=job_id)
     start = time.monotonic()
 
     try:
         ACTIVE_JOBS_GAUGE.inc()
-        _update_job(job_id, status="processing", progress=5)
-        logger.info("ingest_start", job_id=job_id)
+        _publish_progress(job_id, 5, status="processing")
+        log.info("ingest_start")
 
-        from app.storage.backend import get_storage
-        storage = get_storage()
+        storage = _get_storage()
 
-        input_type = _get_job_field(job_id, "input_type")
+        job_meta = _get_job_fields(
+            job_id, "input_type", "youtube_url", "original_filename"
+        )
+        input_type = job_meta.get("input_type")
         job_dir = storage.get_job_dir(job_id)
 
         if input_type == "youtube":
-            youtube_url = _get_job_field(job_id, "youtube_url")
-            logger.info("youtube_download_start", job_id=job_id, url=youtube_url)
+            youtube_url = job_meta.get("youtube_url")
+            log.info("youtube_download_start", url=youtube_url)
             from app.services.audio_ingestion import download_youtube_audio
             audio_path = download_youtube_audio(youtube_url, job_dir)
             _update_job(job_id, original_filename=Path(audio_path).name)
         else:
-            # File already saved by the API endpoint during upload
-            files = list(Path(job_dir).glob("*"))
-            audio_files = [f for f in files if f.suffix.lower() in (".wav", ".mp3", ".flac", ".ogg")]
-            if not audio_files:
-                raise FileNotFoundError(f"No audio file found in {job_dir}")
-            audio_path = str(audio_files[0])
+            # File already saved by the API endpoint during upload — the
+            # recorded filename skips the directory scan entirely
+            audio_path = None
+            if job_meta.get("original_filename"):
+                candidate = Path(job_dir) / job_meta["original_filename"]
+                if candidate.is_file():
+                    audio_path = str(candidate)
+            if audio_path is None:
+                found = next(
+                    (
+                        f.path
+                        for f in os.scandir(job_dir)
+                        if f.name.lower().endswith(AUDIO_EXTS)
+                    ),
+                    None,
+                )
+                if found is None:
+                    raise FileNotFoundError(f"No audio file found in {job_dir}")
+                audio_path = found
 
         # Signal health check — returns metadata to avoid re-loading downstream
         from app.services.audio_ingestion import validate_audio_signal
         audio_meta = validate_audio_signal(audio_path)
-        _update_job(job_id, duration_seconds=audio_meta.get("duration_seconds"))
+        # The decoded array can't follow the job across the queue hop to the
+        # separation worker — drop it here so it doesn't outlive the task
+        audio_meta.pop("audio", None)
 
         elapsed = int((time.monotonic() - start) * 1000)
-        INFERENCE_LATENCY.labels(stage="ingest").observe(elapsed / 1000)
-        _update_job(job_id, progress=15)
-        logger.info("ingest_complete", job_id=job_id, elapsed_ms=elapsed)
+        FAST_STAGE_LATENCY.labels(stage="ingest").observe(elapsed / 1000)
+        # duration_seconds is persisted durably by predict_hits from the
+        # prediction result; ingest only advances the progress bar
+        _publish_progress(job_id, 15)
+        log.info("ingest_complete", elapsed_ms=elapsed)
 
     except Exception as e:
-        logger.error("ingest_failed", job_id=job_id, error=str(e))
+        log.error("ingest_failed", error=str(e))
         _fail_job(job_id, f"Audio ingestion failed: {e}", "ingest")
         raise
 
@@ -195,39 +359,44 @@ def ingest_audio(job_id: str) -> str:
 )
 def separate_drums(self, job_id: str) -> str:
     """Demucs drum separation (heavy-compute queue)."""
-    import structlog
-    logger = structlog.get_logger("task.separate_drums")
+    log = logger.bind(task="separate_drums", job_id=job_id)
     start = time.monotonic()
 
     try:
-        from app.storage.backend import get_storage
-        storage = get_storage()
+        storage = _get_storage()
 
-        _update_job(job_id, status="separating_drums", progress=20)
-        logger.info("separation_start", job_id=job_id)
+        _publish_progress(job_id, 20, status="separating_drums")
+        log.info("separation_start")
 
         job_dir = storage.get_job_dir(job_id)
         drums_path = Path(storage.get_file_path(job_id, "drums.wav"))
 
         # Skip if already separated (idempotency)
         if drums_path.exists() and drums_path.stat().st_size > 0:
-            logger.info("separation_skipped_existing", job_id=job_id)
+            log.info("separation_skipped_existing")
         else:
             from app.ml.engine import run_drum_separation
-            audio_files = [f for f in Path(job_dir).glob("*") if f.suffix.lower() in (".wav", ".mp3", ".flac", ".ogg") and f.name != "drums.wav"]
-            if not audio_files:
+            # First matching entry is enough — no need to list the whole
+            # job dir once artifacts start accumulating in it
+            audio_file = next(
+                (
+                    f.path
+                    for f in os.scandir(job_dir)
+                    if f.name.lower().endswith(AUDIO_EXTS) and f.name != "drums.wav"
+                ),
+                None,
+            )
+            if audio_file is None:
                 raise FileNotFoundError(f"No source audio in {job_dir}")
-            run_drum_separation(str(audio_files[0]), str(drums_path))
-
-        gc.collect()
+            run_drum_separation(audio_file, str(drums_path))
 
         elapsed = int((time.monotonic() - start) * 1000)
-        INFERENCE_LATENCY.labels(stage="separation").observe(elapsed / 1000)
-        _update_job(job_id, progress=50)
-        logger.info("separation_complete", job_id=job_id, elapsed_ms=elapsed)
+        SLOW_STAGE_LATENCY.labels(stage="separation").observe(elapsed / 1000)
+        _publish_progress(job_id, 50)
+        log.info("separation_complete", elapsed_ms=elapsed)
 
     except Exception as e:
-        logger.error("separation_failed", job_id=job_id, error=str(e))
+        log.error("separation_failed", error=str(e))
         _fail_job(job_id, f"Drum separation failed: {e}", "separation")
         raise
 
@@ -243,16 +412,14 @@ def separate_drums(self, job_id: str) -> str:
 )
 def predict_hits(self, job_id: str) -> str:
     """CNN drum hit prediction (heavy-compute queue)."""
-    import structlog
-    logger = structlog.get_logger("task.predict_hits")
+    log = logger.bind(task="predict_hits", job_id=job_id)
     start = time.monotonic()
 
     try:
-        from app.storage.backend import get_storage
-        storage = get_storage()
+        storage = _get_storage()
 
-        _update_job(job_id, status="predicting", progress=55)
-        logger.info("prediction_start", job_id=job_id)
+        _publish_progress(job_id, 55, status="predicting")
+        log.info("prediction_start")
 
         drums_path = storage.get_file_path(job_id, "drums.wav")
 
@@ -279,24 +446,26 @@ def predict_hits(self, job_id: str) -> str:
             confidence_score=result.get("confidence_score"),
             hit_summary=result.get("hit_summary"),
             warnings=warnings,
-            progress=75,
         )
-
-        # Save raw hits data as JSON for the result endpoint
-        import json
-        hits_data = json.dumps(result.get("hits", [])).encode()
-        storage.save_file(job_id, "hits.json", hits_data)
-
-        gc.collect()
+        _publish_progress(job_id, 75)
+
+        # Save raw hits data as JSON for the result endpoint — orjson
+        # emits bytes directly and serializes numpy scalars in-place, so
+        # thousands of hit events skip the str round trip; gzip shrinks
+        # the repetitive hit records 5-10x on disk
+        hits_data = orjson.dumps(
+            result.get("hits", []), option=orjson.OPT_SERIALIZE_NUMPY
+        )
+        storage.save_file_gzip(job_id, "hits.json.gz", hits_data)
 
         elapsed = int((time.monotonic() - start) * 1000)
-        INFERENCE_LATENCY.labels(stage="prediction").observe(elapsed / 1000)
+        SLOW_STAGE_LATENCY.labels(stage="prediction").observe(elapsed / 1000)
         if result.get("duration_seconds"):
             AUDIO_DURATION_PROCESSED.inc(result["duration_seconds"])
-        logger.info("prediction_complete", job_id=job_id, elapsed_ms=elapsed)
+        log.info("prediction_complete", elapsed_ms=elapsed)
 
     except Exception as e:
-        logger.error("prediction_failed", job_id=job_id, error=str(e))
+        log.error("prediction_failed", error=str(e))
         _fail_job(job_id, f"Prediction failed: {e}", "prediction")
         raise
 
@@ -306,30 +475,36 @@ def predict_hits(self, job_id: str) -> str:
 @celery_app.task(name="app.worker.transcribe_and_export")
 def transcribe_and_export(job_id: str) -> str:
     """Transcription (music21) + MusicXML/PDF export."""
-    import structlog
-    logger = structlog.get_logger("task.transcribe_export")
+    log = logger.bind(task="transcribe_export", job_id=job_id)
     start = time.monotonic()
 
     try:
-        from app.storage.backend import get_storage
-        storage = get_storage()
+        storage = _get_storage()
 
-        _update_job(job_id, status="transcribing", progress=80)
-        logger.info("transcription_start", job_id=job_id)
+        _publish_progress(job_id, 80, status="transcribing")
+        log.info("transcription_start")
 
         from app.services.transcription import build_sheet_music
-        from app.services.export import export_musicxml, export_pdf
+        from app.services.export import export_musicxml
 
-        # Load prediction data
-        import json
+        # Load prediction data (plain hits.json is the pre-gzip legacy name,
+        # kept readable for jobs that were in flight across a deploy)
+        hits_gz_path = storage.get_file_path(job_id, "hits.json.gz")
         hits_path = storage.get_file_path(job_id, "hits.json")
 
-        if not storage.file_exists(hits_path):
-            raise FileNotFoundError(f"Hits data not found: {hits_path}")
-
-        hits = json.loads(storage.read_file(hits_path))
-        detected_bpm = _get_job_field(job_id, "detected_bpm") or 120
-        title = _get_job_field(job_id, "title") or "Untitled"
+        if storage.file_exists(hits_gz_path):
+            hits = orjson.loads(storage.read_file_gzip(hits_gz_path))
+        elif storage.file_exists(hits_path):
+            hits = orjson.loads(storage.read_file(hits_path))
+        else:
+            raise FileNotFoundError(f"Hits data not found: {hits_gz_path}")
+        # One row fetch for everything this task needs — detected_bpm,
+        # title, webhook_url and created_at were four separate queries
+        job_meta = _get_job_fields(
+            job_id, "detected_bpm", "title", "created_at", "webhook_url"
+        )
+        detected_bpm = job_meta.get("detected_bpm") or 120
+        title = job_meta.get("title") or "Untitled"
 
         # Build sheet music
         music21_stream = build_sheet_music(hits, detected_bpm, title)
@@ -338,85 +513,196 @@ def transcribe_and_export(job_id: str) -> str:
         musicxml_path = storage.get_file_path(job_id, "sheet_music.musicxml")
         export_musicxml(music21_stream, musicxml_path)
 
-        # Export PDF (may fail if MuseScore not installed — graceful degradation)
         pdf_path = storage.get_file_path(job_id, "sheet_music.pdf")
-        pdf_ok = export_pdf(musicxml_path, pdf_path)
 
         elapsed = int((time.monotonic() - start) * 1000)
 
         # Calculate total compute time from job creation
-        from app.core.database_sync import get_sync_db
-        from app.models.job import Job
-        db = get_sync_db()
-        try:
-            job = db.execute(select(Job).where(Job.id == job_id)).scalar_one_or_none()
-            total_ms = None
-            if job and job.created_at:
-                total_ms = int((datetime.now(timezone.utc) - job.created_at).total_seconds() * 1000)
-        finally:
-            db.close()
-
-        update_fields = dict(
+        total_ms = None
+        if job_meta.get("created_at"):
+            total_ms = int(
+                (datetime.now(timezone.utc) - job_meta["created_at"]).total_seconds() * 1000
+            )
+
+        _update_job(
+            job_id,
             status="completed",
             progress=100,
             result_musicxml_path=musicxml_path,
             compute_time_ms=total_ms,
         )
-        if pdf_ok:
-            update_fields["result_pdf_path"] = pdf_path
-
-        _update_job(job_id, **update_fields)
+        _release_user_slot(job_id)
 
         del music21_stream, hits
-        gc.collect()
+        # One guarded end-of-pipeline collection instead of one per stage:
+        # gc.collect() costs hundreds of ms even when nothing cyclic is
+        # unreachable, and refcounting has already freed the big arrays
+        if _rss_mb() > settings.GC_RSS_THRESHOLD_MB:
+            gc.collect()
 
-        INFERENCE_LATENCY.labels(stage="transcription").observe(elapsed / 1000)
+        FAST_STAGE_LATENCY.labels(stage="transcription").observe(elapsed / 1000)
         JOBS_TOTAL.labels(status="completed").inc()
         ACTIVE_JOBS_GAUGE.dec()
-        logger.info("transcription_complete", job_id=job_id, elapsed_ms=elapsed)
+        log.info("transcription_complete", elapsed_ms=elapsed)
 
-        # Fire webhook if configured
-        webhook_url = _get_job_field(job_id, "webhook_url")
-        if webhook_url:
-            from app.services.webhook import fire_webhook
-            fire_webhook(job_id, webhook_url)
+        # PDF rendering shells out to LilyPond/MuseScore for seconds per
+        # document and is graceful-degradation anyway — it runs as its own
+        # task so the job completes (and the MusicXML is downloadable) now.
+        # The webhook fires from render_pdf once the PDF outcome is known.
+        render_pdf.apply_async((job_id, musicxml_path, pdf_path), queue="default")
 
     except Exception as e:
-        logger.error("transcription_failed", job_id=job_id, error=str(e))
+        log.error("transcription_failed", error=str(e))
         _fail_job(job_id, f"Transcription/export failed: {e}", "transcription")
         raise
 
     return job_id
 
 
+@celery_app.task(name="app.worker.render_pdf", bind=True, max_retries=1)
+def render_pdf(self, job_id: str, musicxml_path: str, pdf_path: str) -> None:
+    """Render the PDF after the job has already completed.
+
+    Keeps the LilyPond/MuseScore wall-clock off the pipeline's critical
+    path; the Job row gains result_pdf_path when the render succeeds and
+    the completion webhook fires once the PDF outcome is known.
+    """
+    log = logger.bind(task="render_pdf", job_id=job_id)
+    from app.services.export import export_pdf
+
+    try:
+        if export_pdf(musicxml_path, pdf_path):
+            _update_job(job_id, result_pdf_path=pdf_path)
+            log.info("render_pdf_complete", pdf=pdf_path)
+    except Exception as e:
+        # PDF is graceful degradation — never resurrect a completed job
+        log.warning("render_pdf_failed", error=str(e))
+
+    webhook_url = _get_job_field(job_id, "webhook_url")
+    if webhook_url:
+        fire_webhook_task.apply_async((job_id, webhook_url), queue="default")
+
+
+@celery_app.task(
+    name="app.worker.ingest_and_separate",
+    bind=True,
+    max_retries=1,
+    acks_late=True,
+    reject_on_worker_lost=True,
+)
+def ingest_and_separate(self, job_id: str) -> str:
+    """Fused ingest + separation stage (heavy-compute queue).
+
+    Running ingest inline before separation drops a broker hop and the
+    queue-boundary re-reads between the two; the stage tasks are called
+    directly so their progress updates and idempotency checks run as
+    before.
+    """
+    ingest_audio(job_id)
+    return separate_drums(job_id)
+
+
+@celery_app.task(
+    name="app.worker.predict_and_export",
+    bind=True,
+    max_retries=1,
+    acks_late=True,
+    reject_on_worker_lost=True,
+)
+def predict_and_export(self, job_id: str) -> str:
+    """Fused prediction + transcription/export stage (heavy-compute queue)."""
+    predict_hits(job_id)
+    return transcribe_and_export(job_id)
+
+
+@celery_app.task(name="app.worker.fail_pipeline")
+def fail_pipeline(request, exc, traceback, job_id: str) -> None:
+    """Chain-level errback — the safety net behind the stage handlers.
+
+    The stages already call _fail_job with a stage label before
+    re-raising; this only acts when a failure bypassed them entirely
+    (worker lost, undeserializable message), so the job still reaches a
+    terminal state.
+    """
+    status = _get_job_field(job_id, "status")
+    if getattr(status, "value", status) not in ("failed", "completed"):
+        _fail_job(job_id, f"Pipeline failed: {exc}", "pipeline")
+
+
+@celery_app.task(
+    name="app.worker.fire_webhook_task",
+    bind=True,
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    max_retries=3,
+)
+def fire_webhook_task(self, job_id: str, webhook_url: str) -> None:
+    """Deliver the completion webhook off the pipeline's critical path.
+
+    HTTP-level failures are retried and dead-lettered inside
+    fire_webhook itself; the task-level retries only cover transient
+    errors building the payload (e.g. a DB blip).
+    """
+    from app.services.webhook import fire_webhook
+
+    fire_webhook(job_id, webhook_url)
+
+
+@celery_app.task(name="app.worker.cleanup_job_artifacts")
+def cleanup_job_artifacts(job_id: str) -> int:
+    """Delete a single job's artifacts (enqueued by DELETE /jobs/{id})."""
+    log = logger.bind(task="cleanup_job", job_id=job_id)
+
+    deleted = _get_storage().delete_job_artifacts(job_id)
+    if deleted > 0:
+        log.info("job_artifacts_deleted", files=deleted)
+    return deleted
+
+
 @celery_app.task(name="app.worker.cleanup_old_artifacts")
 def cleanup_old_artifacts() -> dict:
     """Periodic cleanup of job artifacts older than ARTIFACT_TTL_HOURS."""
-    import structlog
-    logger = structlog.get_logger("task.cleanup")
+    log = logger.bind(task="cleanup")
+
+    from concurrent.futures import ThreadPoolExecutor
 
-    from app.core.database_sync import get_sync_db
+    from app.core.database_sync import SyncScopedSession
     from app.models.job import Job
 
-    from app.storage.backend import get_storage
-    storage = get_storage()
+    storage = _get_storage()
 
     cutoff = datetime.now(timezone.utc) - timedelta(hours=settings.ARTIFACT_TTL_HOURS)
     cleaned = 0
 
-    db = get_sync_db()
+    # Id-only projection — no ORM hydration for rows we only delete by,
+    # and the read transaction ends before the slow filesystem work starts
+    db = SyncScopedSession()
     try:
-        old_jobs = db.execute(
-            select(Job).where(Job.created_at < cutoff)
+        job_ids = db.execute(
+            select(Job.id).where(Job.created_at < cutoff)
         ).scalars().all()
-
-        for job in old_jobs:
-            count = storage.delete_job_artifacts(str(job.id))
-            if count > 0:
-                cleaned += 1
-                logger.info("artifact_cleaned", job_id=str(job.id))
     finally:
-        db.close()
+        db.rollback()
 
-    logger.info("cleanup_complete", cleaned=cleaned)
+    if job_ids:
+        # Artifact deletion is I/O bound (unlink syscalls or S3 calls), so
+        # a backlog of expired jobs clears in parallel instead of serially
+        with ThreadPoolExecutor(max_workers=8) as ex:
+            counts = ex.map(
+                lambda jid: storage.delete_job_artifacts(str(jid)), job_ids
+            )
+            for jid, count in zip(job_ids, counts):
+                if count > 0:
+                    cleaned += 1
+                    log.info("artifact_cleaned", job_id=str(jid))
+
+    log.info("cleanup_complete", cleaned=cleaned)
     return {"cleaned": cleaned}
+
+
+@celery_app.task(name="app.worker.replay_webhook_dlq")
+def replay_webhook_dlq() -> dict:
+    """Periodic replay of dead-lettered webhook deliveries."""
+    from app.services.webhook import replay_dlq
+
+    return {"delivered": replay_dlq()}
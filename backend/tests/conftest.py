@@ -0,0 +1,35 @@
+"""Shared fixtures for the test suite."""
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def client():
+    """Session-scoped sync test client.
+
+    Building a TestClient re-runs app startup (router registration,
+    OpenAPI schema build) every time; one client for the whole session
+    is safe because the API tests are read-only against app state.
+    Entered as a context manager so the lifespan runs and app.state
+    (Redis client, storage singleton) is populated like in production.
+    """
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture(autouse=True)
+def reset_model_resolver():
+    """Drop any ModelResolver singleton created during a test.
+
+    The resolver caches the loaded Keras model for the life of the
+    process; without this, a test that builds a real resolver would leak
+    it into later tests that expect a fresh patch target.
+    """
+    yield
+    from app.ml import registry
+
+    registry.invalidate_model_resolver()
@@ -18,11 +18,8 @@ def anyio_backend():
     return "asyncio"
 
 
-@pytest.fixture
-def client():
-    """Sync test client for basic endpoint checks."""
-    from fastapi.testclient import TestClient
-    return TestClient(app)
+# The sync `client` fixture lives in tests/conftest.py, session-scoped so
+# the app is only stood up once for the whole suite.
 
 
 class TestHealthEndpoint:
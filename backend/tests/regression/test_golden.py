@@ -36,53 +36,82 @@ requires_music21 = pytest.mark.skipif(not HAS_MUSIC21, reason="music21 not insta
 
 FIXTURES_DIR = Path(__file__).parent / "fixtures"
 
+# Exponential decay burst shared by every synthetic beat in sample_audio
+_DECAY_KERNEL = np.exp(-np.linspace(0, 10, 2000)).astype(np.float32) * 0.8
 
-@pytest.fixture
-def sample_audio(tmp_path):
-    """Generate a synthetic drum-like audio file for testing."""
+
+@pytest.fixture(scope="session")
+def sample_audio(tmp_path_factory):
+    """Generate a synthetic drum-like audio file for testing.
+
+    Session-scoped: synthesizing and writing 5 s of 44.1 kHz audio per
+    test added up across TestPredictionPipeline; every test reads the
+    same file and none mutates it.
+    """
     pytest.importorskip("soundfile")
     import soundfile as sf
 
+    tmp_path = tmp_path_factory.mktemp("sample_audio")
     sr = 44100
     duration = 5.0  # seconds
-    t = np.linspace(0, duration, int(sr * duration), endpoint=False)
+    n = int(sr * duration)
+
+    # Simulate kick-like impulses at regular intervals: an impulse train
+    # convolved with one decay kernel — a single FFT convolution instead
+    # of a Python loop placing bursts one beat at a time
+    from scipy.signal import fftconvolve
 
-    # Simulate kick-like impulses at regular intervals
-    signal = np.zeros_like(t)
     beat_interval = int(sr * 0.5)  # 120 BPM
-    for i in range(0, len(t), beat_interval):
-        # Short exponential decay burst
-        burst_len = min(2000, len(t) - i)
-        burst = np.exp(-np.linspace(0, 10, burst_len)) * 0.8
-        signal[i:i + burst_len] += burst
+    impulses = np.zeros(n, dtype=np.float32)
+    impulses[::beat_interval] = 1.0
+    signal = fftconvolve(impulses, _DECAY_KERNEL)[:n]
 
-    # Add some noise
-    signal += np.random.randn(len(signal)) * 0.01
+    # Add some noise — seeded, so onset positions don't drift between runs
+    rng = np.random.default_rng(0)
+    signal += rng.standard_normal(n, dtype=np.float32) * 0.01
 
     audio_path = tmp_path / "test_drums.wav"
     sf.write(str(audio_path), signal, sr)
     return str(audio_path), sr, duration
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_keras_model():
-    """Create a mock Keras model that returns deterministic predictions."""
+    """Create a mock Keras model that returns deterministic predictions.
+
+    Session-scoped — the mock is stateless (pure function of X), so one
+    instance serves every test.
+    """
     model = MagicMock()
 
+    # 6 classes: snare, hihat_closed, kick, ride, tom_high, crash.
+    # One template filled once: kick on every frame, hihat on every 4th.
+    # mock_predict just slices a view — no per-call allocation
+    preds_template = np.zeros((100000, 6), dtype=np.float32)
+    preds_template[:, 2] = 0.95  # kick
+    preds_template[::4, 1] = 0.85  # hihat_closed
+
     def mock_predict(X, verbose=0):
-        batch_size = X.shape[0]
-        # 6 classes: snare, hihat_closed, kick, ride, tom_high, crash
-        # Return high confidence for kick (index 2) on every frame
-        preds = np.zeros((batch_size, 6))
-        preds[:, 2] = 0.95  # kick
-        # Every 4th frame also has hihat
-        preds[::4, 1] = 0.85  # hihat_closed
-        return preds
+        return preds_template[: X.shape[0]]
 
     model.predict = mock_predict
     return model
 
 
+def _make_resolver(keras_model) -> MagicMock:
+    """Build a resolver double wired the way the engine consumes it.
+
+    run_prediction goes through resolver.predict (the traced fast path),
+    not get_keras_model().predict, so the mock must route predict through
+    the model like the real resolver does.
+    """
+    resolver = MagicMock()
+    resolver.get_keras_model.return_value = keras_model
+    resolver.predict.side_effect = keras_model.predict
+    resolver.predict_batch.side_effect = keras_model.predict
+    return resolver
+
+
 # ---------------------------------------------------------------------------
 # Tests
 # ---------------------------------------------------------------------------
@@ -97,9 +126,7 @@ class TestPredictionPipeline:
         audio_path, sr, duration = sample_audio
 
         with patch("app.ml.registry.get_model_resolver") as mock_resolver:
-            resolver_instance = MagicMock()
-            resolver_instance.get_keras_model.return_value = mock_keras_model
-            mock_resolver.return_value = resolver_instance
+            mock_resolver.return_value = _make_resolver(mock_keras_model)
 
             from app.ml.engine import run_prediction
             result = run_prediction(audio_path, user_bpm=120)
@@ -125,9 +152,7 @@ class TestPredictionPipeline:
         audio_path, sr, duration = sample_audio
 
         with patch("app.ml.registry.get_model_resolver") as mock_resolver:
-            resolver_instance = MagicMock()
-            resolver_instance.get_keras_model.return_value = mock_keras_model
-            mock_resolver.return_value = resolver_instance
+            mock_resolver.return_value = _make_resolver(mock_keras_model)
 
             from app.ml.engine import run_prediction
             result = run_prediction(audio_path, user_bpm=120)
@@ -141,9 +166,7 @@ class TestPredictionPipeline:
         audio_path, sr, duration = sample_audio
 
         with patch("app.ml.registry.get_model_resolver") as mock_resolver:
-            resolver_instance = MagicMock()
-            resolver_instance.get_keras_model.return_value = mock_keras_model
-            mock_resolver.return_value = resolver_instance
+            mock_resolver.return_value = _make_resolver(mock_keras_model)
 
             from app.ml.engine import run_prediction
             result = run_prediction(audio_path, user_bpm=120)
@@ -164,9 +187,7 @@ class TestPredictionPipeline:
         audio_path, sr, duration = sample_audio
 
         with patch("app.ml.registry.get_model_resolver") as mock_resolver:
-            resolver_instance = MagicMock()
-            resolver_instance.get_keras_model.return_value = mock_keras_model
-            mock_resolver.return_value = resolver_instance
+            mock_resolver.return_value = _make_resolver(mock_keras_model)
 
             from app.ml.engine import run_prediction
             result = run_prediction(audio_path, user_bpm=90)
@@ -179,9 +200,7 @@ class TestPredictionPipeline:
         audio_path, sr, duration = sample_audio
 
         with patch("app.ml.registry.get_model_resolver") as mock_resolver:
-            resolver_instance = MagicMock()
-            resolver_instance.get_keras_model.return_value = mock_keras_model
-            mock_resolver.return_value = resolver_instance
+            mock_resolver.return_value = _make_resolver(mock_keras_model)
 
             from app.ml.engine import run_prediction
             result = run_prediction(audio_path, user_bpm=120)